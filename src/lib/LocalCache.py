@@ -2,16 +2,65 @@ import os
 import hashlib
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import math
+import mmap
+import orjson
 import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Literal
 import pickle
-import pandas as pd
+import struct
 
 # --- Configuration ---
 DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), ".cache.temp")
 DEFAULT_TTL_SECONDS = 6000
+DEFAULT_MEMORY_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3 # Disk budget, None for unbounded
+EVICTION_TRIGGER_RATIO = 0.9 # Start evicting in the background above this share of max_bytes...
+EVICTION_TARGET_RATIO = 0.7 # ...and stop once the cache is back under this one
+MEMORY_MAX_ENTRY_BYTES = 1024 * 1024 # Larger values (images, big frames) are only kept on disk
+URL_CHUNK_SIZE = 1024 * 1024
+URL_CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "application/json": ".json",
+    "text/html": ".html",
+}
+DISABLED_CHECK_INTERVAL = 1.0 # Seconds between checks of the cache-disabled flag file
+MMAP_MIN_BYTES = 64 * 1024 # Smaller files are cheaper to read() than to map
+# Values unpickled from a mapped file keep it mapped, and on Windows a mapped file
+# can't be replaced or removed (later writes and eviction of that key would fail)
+MMAP_READS = os.name == "posix"
+
+# Which `_print` messages are shown, set with the `print` option
+PRINT_MASKS = {"hits": 1, "misses": 2, "errors": 4}
+PRINT_TYPE_MASKS = {"hit": 1, "miss": 2, "error": 4}
+DEFAULT_PRINT = ("misses", "errors")
+
+# Default for `invalidate_if_return`: no return value invalidates the entry
+_INVALIDATE = object()
+
+# Decorated calls with only these argument types reuse their derived key (see `cache`)
+SIMPLE_KEY_TYPES = frozenset({str, int, float, bool, type(None)})
+KEY_MEMO_MAX_ENTRIES = 4096
+
+# Pickle files with out-of-band buffers (numpy/pandas data) are framed as:
+# magic | pickle length, buffer count | buffer lengths | pickle | buffers...
+PICKLE_FRAME_MAGIC = b"LCP5"
+PICKLE_FRAME_HEADER = struct.Struct("<QI")
+
+# Values that are stored as JSON (exact types, subclasses go through Pickle)
+JSON_VALUE_TYPES = frozenset({dict, list, tuple, str, int, float, bool, type(None)})
+
+# Values orjson would silently convert (datetimes, dataclasses, str/int subclasses)
+# must raise instead, so they fall back to Pickle and round-trip unchanged.
+ORJSON_VALUE_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+ORJSON_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
 class LocalCache:
     """
@@ -23,51 +72,364 @@ class LocalCache:
     """
 
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super(LocalCache, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(LocalCache, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
 
+    @classmethod
+    def instance(cls) -> "LocalCache":
+        """
+        Returns the shared cache handler, creating it with the defaults on first use.
+        """
+        return cls._instance if cls._instance is not None and cls._instance._initialized else cls()
+
     def __init__(self,
             cache_dir: str = DEFAULT_CACHE_DIR,
-            print: list[str] = ['misses', 'errors']
+            print: list[str] | None = None,
+            memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+            durability: Literal["none", "fdatasync", "fsync"] = "none",
+            max_bytes: int | None = DEFAULT_MAX_BYTES
         ):
         if self._initialized:
             return
 
+        # First use can happen from several threads at once, only one of them sets up the instance
+        with self._instance_lock:
+            if self._initialized:
+                return
+            self._setup(cache_dir, print, memory_entries, durability, max_bytes)
+            self._initialized = True
+
+    def _setup(self,
+            cache_dir: str,
+            print: list[str] | None,
+            memory_entries: int,
+            durability: Literal["none", "fdatasync", "fsync"],
+            max_bytes: int | None
+        ) -> None:
         self.cache_dir = cache_dir
         os.makedirs(self.cache_dir, exist_ok=True)
-        self._initialized = True
-        self.print_hits = 'hits' in print
-        self.print_misses = 'misses' in print
-        self.print_errors = 'errors' in print
+        print = DEFAULT_PRINT if print is None else print
+        self._print_mask = sum(mask for name, mask in PRINT_MASKS.items() if name in print)
 
         self.cache_disabled_flag = os.path.join(self.cache_dir, ".py-local-cache-disabled")
+        self._disabled_check = (False, float("-inf")) # (disabled, time.monotonic() of the check)
+        self._known_dirs = set()
+
+        # Flush policy for cache writes. The cache can always be rebuilt, so by default
+        # files are left to the OS page cache; "fdatasync"/"fsync" trade write speed for crash safety.
+        if durability not in ("none", "fdatasync", "fsync"):
+            raise ValueError(f"Invalid durability: {durability}")
+        if durability == "fdatasync" and not hasattr(os, "fdatasync"):
+            durability = "fsync"  # Not available on Windows/macOS
+        self.durability = durability
+
+        # Size-bounded eviction: writes add to a running total and wake a background
+        # thread that deletes the least recently used files once the budget is reached
+        self.max_bytes = max_bytes
+        self._total_bytes = 0
+        self._last_access = {}
+        self._eviction_event = threading.Event()
+        self._eviction_thread = None
+
+        # Keys known to have a file on disk -> its format (".json"/".pkl"), so lookups read
+        # that file first. Keys written by other processes are picked up on their first lookup.
+        self._known_keys = self._scan_known_keys()
+
+        # Shared HTTP session for `cache_url`, so downloads reuse kept-alive connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
+        # In-memory LRU in front of the files: key -> (expire_at, pickled value)
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+
+    def _scan_cache(self, with_stat: bool = True):
+        """
+        Walks the cache subfolders and yields `(DirEntry, stat_result)` for each cache file,
+        skipping writes in progress. The stat comes from the directory entry
+        (no path lookup) and is None when `with_stat` is False.
+        """
+        with os.scandir(self.cache_dir) as subfolders:
+            for subfolder in subfolders:
+                if not subfolder.is_dir(follow_symlinks=False):
+                    continue
+                self._known_dirs.add(subfolder.name)
+                with os.scandir(subfolder.path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".tmp"):
+                            continue
+                        if not with_stat:
+                            yield entry, None
+                            continue
+                        try:
+                            yield entry, entry.stat(follow_symlinks=False)
+                        except FileNotFoundError:
+                            continue  # Removed while scanning
+
+    def _scan_known_keys(self) -> dict:
+        """
+        Collects the keys and formats of the entry files (.json/.pkl) already in the cache dir.
+        """
+        known_keys = {}
+        for entry, stat in self._scan_cache(with_stat=self.max_bytes is not None):
+            name = entry.name
+            if stat is not None:
+                self._total_bytes += stat.st_size
+            if ".content" in name:
+                continue  # Downloaded URL bodies, not entries
+            if name.endswith(".json"):
+                known_keys[name[:-5]] = ".json"
+            elif name.endswith(".pkl"):
+                known_keys[name[:-4]] = ".pkl"
+        return known_keys
 
     def _is_cache_disabled(self) -> bool:
-        return os.path.exists(self.cache_disabled_flag)
-
-    def _print(self, msg: str, type: str = "hit") -> None:
-        if self.print_hits and type == "hit":
-            print(f"[Cache {type.upper()}] {msg}")
-        elif self.print_misses and type == "miss":
-            print(f"[Cache {type.upper()}] {msg}")
-        elif self.print_errors and type == "error":
-            print(f"[Cache {type.upper()}] {msg}")
+        # The flag file can be toggled by other processes, so it's re-checked at most once per second
+        now = time.monotonic()
+        disabled, checked_at = self._disabled_check
+        if now - checked_at > DISABLED_CHECK_INTERVAL:
+            disabled = os.path.exists(self.cache_disabled_flag)
+            self._disabled_check = (disabled, now)
+        return disabled
+
+    def _print(self, msg: str, *args, type: str = "hit") -> None:
+        """
+        Prints a %-style message if its type is enabled, `msg % args` is only built then.
+        """
+        if self._print_mask & PRINT_TYPE_MASKS.get(type, 0):
+            print(f"[Cache {type.upper()}] {msg % args if args else msg}")
 
     def _get_file_path(self, key: str, ext: str = "") -> str:
         subfolder = key[:2]
         file_name = key + ext
         path = os.path.join(self.cache_dir, subfolder)
-        os.makedirs(path, exist_ok=True)
+        # Only create each subfolder once per process
+        if subfolder not in self._known_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._known_dirs.add(subfolder)
         return os.path.join(path, file_name)
 
+    def _hash_key(self, data: str | bytes) -> str:
+        """Derive a cache key from a string or bytes (BLAKE2b, 128-bit hex digest)."""
+        if isinstance(data, str):
+            data = data.encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _read_file(self, path: str, writable: bool = False) -> bytes | bytearray | memoryview | None:
+        """
+        Reads a cache file in one open() call, returning None if it doesn't exist.
+        With `writable`, the content is returned as a bytearray (arrays unpickled from it stay writable).
+
+        On POSIX, files of `MMAP_MIN_BYTES` or more are memory-mapped instead of copied, the mapping
+        is released along with the returned view (and anything unpickled on top of it).
+        Writable maps are private copy-on-write, so writes never reach the file.
+        """
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if MMAP_READS and size >= MMAP_MIN_BYTES:
+                    access = mmap.ACCESS_COPY if writable else mmap.ACCESS_READ
+                    return memoryview(mmap.mmap(f.fileno(), 0, access=access))
+                if not writable:
+                    return f.read()
+                data = bytearray(size)
+                size = f.readinto(data)
+                return data if size == len(data) else data[:size]
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _atomic_file(self, path: str):
+        """
+        Opens a sibling temp file for writing and moves it over `path` on success,
+        so readers never see a partial file. On failure the temp file is removed.
+        """
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            f = open(tmp_path, "wb")
+        except FileNotFoundError:
+            # The subfolder was removed after `_get_file_path` created it (e.g. the cache was cleared by hand)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(tmp_path, "wb")
+        try:
+            with f:
+                yield f
+                f.flush()
+                if self.durability == "fdatasync":
+                    os.fdatasync(f.fileno())
+                elif self.durability == "fsync":
+                    os.fsync(f.fileno())
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove_file(tmp_path)
+            raise
+        self._track_write(os.path.basename(path).split(".", 1)[0], size)
+
+    def _track_write(self, key: str, size: int) -> None:
+        """
+        Counts a written file against `max_bytes` and schedules an eviction when needed.
+        Overwrites are counted again, the eviction pass recomputes the real total.
+        """
+        self._last_access[key] = time.time()
+        if self.max_bytes is None:
+            return
+        self._total_bytes += size
+        if self._total_bytes > self.max_bytes * EVICTION_TRIGGER_RATIO:
+            self._request_eviction()
+
+    def _request_eviction(self) -> None:
+        """Wakes the eviction thread, starting it on first use."""
+        if self._eviction_thread is None:
+            with self._instance_lock:
+                if self._eviction_thread is None:
+                    self._eviction_thread = threading.Thread(
+                        target=self._eviction_loop, name="LocalCache-eviction", daemon=True
+                    )
+                    self._eviction_thread.start()
+        self._eviction_event.set()
+
+    def _eviction_loop(self) -> None:
+        while True:
+            self._eviction_event.wait()
+            self._eviction_event.clear()
+            try:
+                self._evict()
+            except Exception as e:
+                self._print("Cache eviction failed: %s", e, type="error")
+
+    def _evict(self) -> None:
+        """
+        Deletes the least recently used cache files until the cache is back under
+        `EVICTION_TARGET_RATIO` of `max_bytes`.
+
+        Recency is the last hit/write seen by this process, or the file mtime for
+        keys not touched since startup.
+        """
+        files = []
+        total_bytes = 0
+        for entry, stat in self._scan_cache():
+            key = entry.name.split(".", 1)[0]
+            last_access = max(self._last_access.get(key, 0), stat.st_mtime)
+            files.append((last_access, key, entry.path, stat.st_size))
+            total_bytes += stat.st_size
+
+        target_bytes = self.max_bytes * EVICTION_TARGET_RATIO
+        if total_bytes > target_bytes:
+            files.sort()
+            for _, key, path, size in files:
+                if total_bytes <= target_bytes:
+                    break
+                self._remove_file(path)
+                self._known_keys.pop(key, None)
+                self._last_access.pop(key, None)
+                total_bytes -= size
+            self._print("Cache evicted down to %s bytes", total_bytes, type="hit")
+        self._total_bytes = total_bytes
+
+    def _write_file(self, path: str, *chunks: bytes) -> None:
+        """
+        Writes a cache file atomically (see `_atomic_file`).
+        """
+        with self._atomic_file(path) as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def _remove_file(self, path: str) -> None:
+        """Removes a cache file, ignoring it if it's already gone."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
     def _is_expired(self, expire_at: float) -> bool:
         """Check if given expiration timestamp has passed."""
         return time.time() > expire_at
 
+    def _pickle_dumps(self, value: Any) -> list:
+        """
+        Pickles a value (protocol 5), keeping large numpy/pandas buffers out-of-band
+        so they are written as-is instead of being copied into the pickle stream.
+
+        Returns:
+            list: The chunks to write, in order.
+        """
+        buffers = []
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffers.append)
+        if not buffers:
+            return [data]
+
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        header = PICKLE_FRAME_MAGIC + PICKLE_FRAME_HEADER.pack(len(data), len(raw_buffers))
+        lengths = struct.pack(f"<{len(raw_buffers)}Q", *(buffer.nbytes for buffer in raw_buffers))
+        return [header, lengths, data, *raw_buffers]
+
+    def _pickle_loads(self, data: bytes | bytearray | memoryview) -> Any:
+        """
+        Unpickles the content of a pickle cache file (framed or plain).
+        Out-of-band buffers are views into `data`, so arrays share its memory instead of copying it.
+        """
+        if data[:len(PICKLE_FRAME_MAGIC)] != PICKLE_FRAME_MAGIC:
+            return pickle.loads(data)
+
+        view = memoryview(data)
+        offset = len(PICKLE_FRAME_MAGIC)
+        data_length, buffer_count = PICKLE_FRAME_HEADER.unpack_from(view, offset)
+        offset += PICKLE_FRAME_HEADER.size
+        lengths = struct.unpack_from(f"<{buffer_count}Q", view, offset)
+        offset += 8 * buffer_count
+
+        payload = view[offset:offset + data_length]
+        offset += data_length
+        buffers = []
+        for length in lengths:
+            buffers.append(view[offset:offset + length])
+            offset += length
+        return pickle.loads(payload, buffers=buffers)
+
+    def _memory_get(self, key: str) -> tuple[Any, float] | None:
+        """
+        Returns the in-memory `(value, expire_at)` for a key, or None if missing or expired.
+        Values are kept pickled, so each hit gets its own copy (like a file hit).
+        """
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expire_at, data = entry
+            if self._is_expired(expire_at):
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+        return pickle.loads(data), expire_at
+
+    def _memory_set(self, key: str, value: Any, expire_at: float) -> None:
+        """Stores a value in the in-memory LRU, evicting the oldest entries."""
+        if self.memory_entries <= 0:
+            return
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        if len(data) > MEMORY_MAX_ENTRY_BYTES:
+            return
+        with self._memory_lock:
+            self._memory[key] = (expire_at, data)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
     def _save_to_cache(self, key: str, result: Any, ttl_s: int) -> None:
         """
         Saves a result with TTL using JSON if possible, otherwise Pickle.
@@ -76,88 +438,181 @@ class LocalCache:
         """
         expire_at = time.time() + ttl_s
         wrapped = {"expire_at": expire_at, "value": result}
-
         json_cache_path = self._get_file_path(key, ext=".json")
         pickle_cache_path = self._get_file_path(key, ext=".pkl")
 
-        try:
-            with open(json_cache_path, "w") as f:
-                json.dump(wrapped, f)
-            self._print(f"Result for key '{key}' cached to {json_cache_path}")
-            if os.path.exists(pickle_cache_path):
-                os.remove(pickle_cache_path)
-        except TypeError:
+        data = None
+        if self._is_json_candidate(result):
             try:
-                with open(pickle_cache_path, "wb") as f:
-                    pickle.dump(wrapped, f)
-                if os.path.exists(json_cache_path):
-                    os.remove(json_cache_path)
-                self._print(f"Result for key '{key}' cached (Pickle) to {pickle_cache_path}")
-            except Exception as e:
-                self._print(f"Failed to save to cache for key '{key}': {e}", type="error")
+                data = orjson.dumps(wrapped, option=ORJSON_VALUE_OPTIONS)
+            except TypeError:
+                pass  # A nested value JSON can't keep, use Pickle
+            else:
+                # orjson writes NaN/Infinity as null, keep those values exact with Pickle
+                if b"null" in data and self._has_non_finite_float(result):
+                    data = None
+
+        try:
+            if data is not None:
+                self._write_file(json_cache_path, data)
+                self._known_keys[key] = ".json"
+                self._print("Result for key '%s' cached to %s", key, json_cache_path)
+                self._remove_file(pickle_cache_path)
+            else:
+                self._write_file(pickle_cache_path, *self._pickle_dumps(wrapped))
+                self._known_keys[key] = ".pkl"
+                self._remove_file(json_cache_path)
+                self._print("Result for key '%s' cached (Pickle) to %s", key, pickle_cache_path)
         except Exception as e:
-            self._print(f"Failed to save to cache for key '{key}': {e}", type="error")
+            self._print("Failed to save to cache for key '%s': %s", key, e, type="error")
 
-    def _load_from_cache(self, key: str, invalidate_if_return: Any = '__INVALIDATE__') -> Any:
+    def _is_json_candidate(self, value: Any) -> bool:
         """
-        Attempts to load a cached result (JSON first, then Pickle).
-        TTL is checked automatically.
+        Cheap type check deciding whether a value is worth trying as JSON.
+        DataFrames, datetimes, etc. go straight to Pickle instead of failing inside orjson,
+        deeper values are still checked by orjson itself.
         """
-        json_cache_path = self._get_file_path(key, ext=".json")
-        pickle_cache_path = self._get_file_path(key, ext=".pkl")
+        value_type = type(value)
+        if value_type is dict:
+            return all(type(item) in JSON_VALUE_TYPES for item in value.values())
+        return value_type in JSON_VALUE_TYPES
 
-        # Try JSON cache
-        if os.path.exists(json_cache_path):
+    def _has_non_finite_float(self, value: Any) -> bool:
+        """
+        Whether a JSON-able value contains a NaN or infinite float (at any depth).
+        """
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            item_type = type(item)
+            if item_type is float:
+                if not math.isfinite(item):
+                    return True
+            elif item_type is dict:
+                stack.extend(item.values())
+            elif item_type is list or item_type is tuple:
+                stack.extend(item)
+        return False
+
+    def _load_entry(self, key: str, invalidate_if_return: Any = _INVALIDATE) -> dict | None:
+        """
+        Loads the wrapped cache entry ({"expire_at", "value"}) for a key, or None.
+        """
+        # Open directly (a missing file is the common miss), starting with the key's last
+        # known format. The other one is still tried, another process may have rewritten it.
+        if self._known_keys.get(key) == ".pkl":
+            loaders = (self._load_pickle_entry, self._load_json_entry)
+        else:
+            loaders = (self._load_json_entry, self._load_pickle_entry)
+        for loader in loaders:
+            wrapped = loader(key, invalidate_if_return)
+            if wrapped is not None:
+                return wrapped
+        return None
+
+    def _load_json_entry(self, key: str, invalidate_if_return: Any = _INVALIDATE) -> dict | None:
+        """
+        Loads the wrapped cache entry for a key from its JSON file, or None.
+        """
+        json_cache_path = self._get_file_path(key, ext=".json")
+        data = self._read_file(json_cache_path)
+        if data is not None:
             try:
-                with open(json_cache_path, "r") as f:
-                    wrapped = json.load(f)
+                try:
+                    wrapped = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    # Files written by the stdlib encoder may contain NaN/Infinity
+                    wrapped = json.loads(bytes(data))
                 expire_at = wrapped.get("expire_at", 0)
                 if self._is_expired(expire_at):
-                    self._print(f"Cache expired for key '{key}' (JSON)", type="miss")
-                    os.remove(json_cache_path)
+                    self._print("Cache expired for key '%s' (JSON)", key, type="miss")
+                    self._remove_file(json_cache_path)
                     return None
                 cache_value = wrapped.get("value")
-                if invalidate_if_return is not '__INVALIDATE__' and cache_value == invalidate_if_return:
-                    self._print(f"Cache invalidated for key '{key}'.", type="miss")
-                    os.remove(json_cache_path)
+                if invalidate_if_return is not _INVALIDATE and cache_value == invalidate_if_return:
+                    self._print("Cache invalidated for key '%s'.", key, type="miss")
+                    self._remove_file(json_cache_path)
                 else:
-                    self._print(f"Cache hit (JSON) for key '{key}'", type="hit")
-                    return cache_value
+                    self._print("Cache hit (JSON) for key '%s'", key, type="hit")
+                    self._known_keys[key] = ".json"
+                    self._last_access[key] = time.time()
+                    return wrapped
             except Exception as e:
-                self._print(f"JSON cache file corrupt for key '{key}': {e}", type="error")
-                os.remove(json_cache_path)
+                self._print("JSON cache file corrupt for key '%s': %s", key, e, type="error")
+                self._remove_file(json_cache_path)
 
-        # Try Pickle cache
-        if os.path.exists(pickle_cache_path):
+        return None
+
+    def _load_pickle_entry(self, key: str, invalidate_if_return: Any = _INVALIDATE) -> dict | None:
+        """
+        Loads the wrapped cache entry for a key from its Pickle file, or None.
+        """
+        pickle_cache_path = self._get_file_path(key, ext=".pkl")
+        data = self._read_file(pickle_cache_path, writable=True)
+        if data is not None:
             try:
-                with open(pickle_cache_path, "rb") as f:
-                    wrapped = pickle.load(f)
+                wrapped = self._pickle_loads(data)
                 expire_at = wrapped.get("expire_at", 0)
                 if self._is_expired(expire_at):
-                    self._print(f"Cache expired for key '{key}' (Pickle)", type="miss")
-                    os.remove(pickle_cache_path)
+                    self._print("Cache expired for key '%s' (Pickle)", key, type="miss")
+                    self._remove_file(pickle_cache_path)
                     return None
                 cache_value = wrapped.get("value")
-                if invalidate_if_return is not '__INVALIDATE__' and cache_value == invalidate_if_return:
-                    self._print(f"Cache invalidated for key '{key}'.", type="miss")
-                    os.remove(pickle_cache_path)
+                if invalidate_if_return is not _INVALIDATE and cache_value == invalidate_if_return:
+                    self._print("Cache invalidated for key '%s'.", key, type="miss")
+                    self._remove_file(pickle_cache_path)
                 else:
-                    self._print(f"Cache hit (Pickle) for key '{key}'", type="hit")
-                    return cache_value
+                    self._print("Cache hit (Pickle) for key '%s'", key, type="hit")
+                    self._known_keys[key] = ".pkl"
+                    self._last_access[key] = time.time()
+                    return wrapped
             except Exception as e:
-                self._print(f"Pickle cache file corrupt for key '{key}': {e}", type="error")
-                os.remove(pickle_cache_path)
+                self._print("Pickle cache file corrupt for key '%s': %s", key, e, type="error")
+                self._remove_file(pickle_cache_path)
 
         return None
 
-    def _cache_handler(self, key: str, ttl_s: int, func: Callable, args: tuple, kwargs: dict, invalidate_if_return: Any = '__INVALIDATE__') -> Any:
-        cached_value = self._load_from_cache(key, invalidate_if_return)
+    def _cache_lookup_entry(self, key: str, invalidate_if_return: Any = _INVALIDATE) -> tuple[Any, float]:
+        """
+        Returns a cached `(value, expire_at)` from memory, then disk (promoting disk hits to memory),
+        or `(None, 0)` on a miss.
+        """
+        entry = self._memory_get(key)
+        if entry is not None:
+            self._last_access[key] = time.time()
+            return entry
+
+        wrapped = self._load_entry(key, invalidate_if_return)
+        if wrapped and wrapped.get("value") is not None:
+            expire_at = wrapped.get("expire_at", 0)
+            self._memory_set(key, wrapped["value"], expire_at)
+            return wrapped["value"], expire_at
+        return None, 0
+
+    def _cache_lookup(self, key: str, invalidate_if_return: Any = _INVALIDATE) -> Any:
+        """
+        Returns a cached value from memory, then disk, or None.
+        """
+        return self._cache_lookup_entry(key, invalidate_if_return)[0]
+
+    def _cache_store(self, key: str, result: Any, ttl_s: int, invalidate_if_return: Any = _INVALIDATE) -> None:
+        """
+        Saves a freshly computed result to disk and memory.
+        """
+        self._save_to_cache(key, result, ttl_s)
+
+        # Results that would be invalidated on the next load are not kept in memory
+        if result is not None and (invalidate_if_return is _INVALIDATE or not result == invalidate_if_return):
+            self._memory_set(key, result, time.time() + ttl_s)
+
+    def _cache_handler(self, key: str, ttl_s: int, func: Callable, args: tuple, kwargs: dict, invalidate_if_return: Any = _INVALIDATE) -> Any:
+        cached_value = self._cache_lookup(key, invalidate_if_return)
         if cached_value is not None:
             return cached_value
 
-        self._print(f"Cache miss for key '{key}', running original function: '{func.__name__}'", type="miss")
+        self._print("Cache miss for key '%s', running original function: '%s'", key, func.__name__, type="miss")
         result = func(*args, **kwargs)
-        self._save_to_cache(key, result, ttl_s)
+        self._cache_store(key, result, ttl_s, invalidate_if_return)
         return result
 
     # ---------------------
@@ -167,13 +622,20 @@ class LocalCache:
         """
         Stores a value in the cache with TTL.
         """
-        self._save_to_cache(key, value, ttl_s)
+        self._cache_store(key, value, ttl_s)
 
     def get(self, key: str) -> Any:
         """
         Retrieves a value from the cache if not expired.
+        Repeated gets are served from the in-memory LRU.
         """
-        return self._load_from_cache(key)
+        return self._cache_lookup(key)
+
+    def get_with_expiry(self, key: str) -> tuple[Any, float]:
+        """
+        Like `get`, but also returns when the value expires: `(value, expire_at)`, or `(None, 0)` on a miss.
+        """
+        return self._cache_lookup_entry(key)
 
     # ---------------------
     # URL interface
@@ -184,80 +646,92 @@ class LocalCache:
         if not url or url.startswith("file://") or url.startswith("http://localhost"):
             return url
 
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        url_hash = self._hash_key(url)
 
-        def fetch_url_content():
+        def fetch_url_file():
             try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                return response.content
+                # Stream the body straight to its final file, only the path is cached
+                with self._http.get(url, stream=True, timeout=10) as response:
+                    response.raise_for_status()
+                    file_path = self._get_url_file_path(url_hash, response.headers.get("Content-Type", ""))
+                    with self._atomic_file(file_path) as f:
+                        for chunk in response.iter_content(chunk_size=URL_CHUNK_SIZE):
+                            f.write(chunk)
+                    return file_path
             except requests.exceptions.RequestException as e:
-                self._print(f"Failed to fetch {url}: {e}", type="error")
+                self._print("Failed to fetch %s: %s", url, e, type="error")
                 return url
             except Exception as e:
-                self._print(f"Unexpected error caching {url}: {e}", type="error")
+                self._print("Unexpected error caching %s: %s", url, e, type="error")
                 return url
 
-        cached_data = self._cache_handler(url_hash, ttl_s, fetch_url_content, (), {})
-
-        if cached_data != url:
-            content_type = ""
-            try:
-                response = requests.head(url, timeout=5)
-                content_type = response.headers.get("Content-Type", "")
-            except requests.exceptions.RequestException:
-                pass
+        file_path = self._cache_handler(url_hash, ttl_s, fetch_url_file, (), {})
 
-            ext = ""
-            if "image/jpeg" in content_type: ext = ".jpg"
-            elif "image/png" in content_type: ext = ".png"
-            elif "application/json" in content_type: ext = ".json"
-            elif "text/html" in content_type: ext = ".html"
+        if file_path != url and not os.path.exists(file_path):
+            # The downloaded file was removed, fetch it again
+            file_path = fetch_url_file()
+            self._cache_store(url_hash, file_path, ttl_s)
 
-            final_cache_path = self._get_file_path(url_hash, ext=ext)
-            with open(final_cache_path, "wb") as f:
-                f.write(cached_data)
-            return final_cache_path
+        return file_path
 
-        return url
+    def _get_url_file_path(self, url_hash: str, content_type: str) -> str:
+        """
+        Path for a downloaded URL body, with an extension matching its content type.
+        The ".content" suffix keeps it apart from the entry's own .json/.pkl file.
+        """
+        ext = URL_CONTENT_TYPE_EXTENSIONS.get(content_type.split(";", 1)[0].strip().lower(), "")
+        return self._get_file_path(url_hash, ext=f".content{ext}")
 
     # ---------------------
     # Decorator interface
     # ---------------------
-    def cache(self, ttl_s: int = DEFAULT_TTL_SECONDS, invalidate_if_return: Any = '__INVALIDATE__'):
+    def cache(self, ttl_s: int = DEFAULT_TTL_SECONDS, invalidate_if_return: Any = _INVALIDATE):
         def decorator(func: Callable):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                if self._is_cache_disabled():
-                    return func(*args, **kwargs)
-
-                is_method = '.' in func.__qualname__
-                instance_id = None
-                cache_args = args
-
-                if is_method and args:
-                    instance = args[0]
-                    if hasattr(instance, 'instance_id'):
-                        instance_id = str(instance.instance_id)
-                    else:
-                        instance_id = "__DEFAULT__"
-                    cache_args = args[1:]
-
-                key_components = [func.__name__, cache_args, kwargs]
+            key_memo = {}
+            func_name = func.__name__
+
+            def make_key(instance_id: str | None, cache_args: tuple, kwargs: dict) -> str:
+                # Scalar args are hashable, so the derived key is memoized and the
+                # serialize + hash step only runs once per distinct call.
+                # Types are part of the memo key, since 1 == 1.0 == True in Python.
+                memo_key = None
+                kwargs_items = tuple(sorted(kwargs.items())) if kwargs else ()
+                arg_types = tuple(type(value) for value in cache_args) + tuple(type(value) for _, value in kwargs_items)
+                if SIMPLE_KEY_TYPES.issuperset(arg_types):
+                    memo_key = (instance_id, cache_args, kwargs_items, arg_types)
+                    key = key_memo.get(memo_key)
+                    if key is not None:
+                        return key
+
+                key_components = [func_name, cache_args, kwargs]
                 if instance_id:
                     key_components.append(instance_id)
 
-                args_str = json.dumps(key_components, sort_keys=True)
-                key = hashlib.md5(args_str.encode()).hexdigest()
-
-                return self._cache_handler(
-                    key=key,
-                    ttl_s=ttl_s,
-                    func=func,
-                    args=args,
-                    kwargs=kwargs,
-                    invalidate_if_return=invalidate_if_return
-                )
+                args_str = orjson.dumps(key_components, option=ORJSON_KEY_OPTIONS)
+                key = self._hash_key(args_str)
+
+                if memo_key is not None:
+                    if len(key_memo) >= KEY_MEMO_MAX_ENTRIES:
+                        key_memo.clear()
+                    key_memo[memo_key] = key
+                return key
+
+            # Whether func is a method doesn't change between calls, so pick the wrapper once
+            if '.' in func.__qualname__:
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    if self._is_cache_disabled():
+                        return func(*args, **kwargs)
+                    if not args:
+                        return self._cache_handler(make_key(None, args, kwargs), ttl_s, func, args, kwargs, invalidate_if_return)
+                    instance_id = str(getattr(args[0], 'instance_id', "__DEFAULT__"))
+                    return self._cache_handler(make_key(instance_id, args[1:], kwargs), ttl_s, func, args, kwargs, invalidate_if_return)
+            else:
+                @wraps(func)
+                def wrapper(*args, **kwargs):
+                    if self._is_cache_disabled():
+                        return func(*args, **kwargs)
+                    return self._cache_handler(make_key(None, args, kwargs), ttl_s, func, args, kwargs, invalidate_if_return)
             return wrapper
         return decorator
 
@@ -266,12 +740,14 @@ class LocalCache:
     # ---------------------
     def disable_cache(self):
         open(self.cache_disabled_flag, "a").close()
+        self._disabled_check = (True, time.monotonic())
 
     def enable_cache(self):
         try:
             os.remove(self.cache_disabled_flag)
         except FileNotFoundError:
             pass
+        self._disabled_check = (False, time.monotonic())
 
 # Initialize global cache handler
-cache_handler = LocalCache()
+cache_handler = LocalCache.instance()
@@ -1,5 +1,7 @@
 import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
@@ -7,6 +9,15 @@ from concurrent.futures import ThreadPoolExecutor
 from lib.LocalCache import cache_handler
 from lib.Utils import Utils
 
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 0.1 # Doubled after each failed attempt
+
+# Requesters are created per batch, so the connection pool lives at module level
+# and kept-alive connections (and their TLS sessions) are reused across batches.
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
 class SimpleBatchRequester:
     def __init__(self, max_workers=5):
         """
@@ -16,6 +27,30 @@ class SimpleBatchRequester:
             max_workers (int): The maximum number of threads to use.
         """
         self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the worker pool. The requester can still be used, a new pool is started on the next run.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _get_pool(self):
+        """
+        Returns the requester's worker pool, reused by every batch it runs.
+        Concurrent runs share it, so `max_workers` caps their requests in total.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batchreq")
+            return self._pool
 
     def _worker(self, request_data, request_index):
         """
@@ -25,12 +60,13 @@ class SimpleBatchRequester:
             request_index (int): The original index of the request in the input list.
 
         Returns:
-            dict: A dictionary containing the request index and the result.
+            tuple: A dictionary containing the request index and the result, and the
+                   `(key, result, ttl)` cache entry to save (None if nothing to cache).
         """
         request_id = request_data.get('id') or request_index
         context = request_data.get('context', None)
         cache_time = request_data.get('cache_time', None)
-        cache_hash = Utils.hash(request_data)
+        cache_hash = Utils.hash(request_data) if cache_time is not None else None
         request_ok = False
         
         try:
@@ -41,35 +77,56 @@ class SimpleBatchRequester:
             headers = request_data.get('headers')
             timeout = request_data.get('timeout', 10)
             
-            if cache_time != None:
+            if cache_hash is not None:
                 cached_result = cache_handler.get(cache_hash)
                 if cached_result is not None:
                     print(f"[BatchRequest] Cache hit for {request_data.get('url')}")
-                    return cached_result
-
-            response = requests.request(
-                method,
-                url,
-                params=params,
-                data=data,
-                headers=headers,
-                timeout=timeout
-            )
-            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+                    return cached_result, None
+
+            response = self._request_with_retries(method, url, params, data, headers, timeout)
             request_result = {
                 'status_code': response.status_code,
                 'context': context,
-                'content': response.json() if 'application/json' in response.headers.get('Content-Type', '') else response.text
+                'content': orjson.loads(response.content) if 'application/json' in response.headers.get('Content-Type', '') else response.text
             }
             request_ok = True
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"[BatchRequest] Request failed for {request_data.get('url')}: {e}")
             request_result = {'error': str(e)}
 
         request_result = {'id': request_id, 'index': request_index, 'result': request_result}
-        if cache_time is not None and request_ok:
-            cache_handler.set(cache_hash, request_result, ttl_s=cache_time)
-        return request_result
+        # Saved by `run` once the batch is done, so workers go straight to the next request
+        cache_entry = (cache_hash, request_result, cache_time) if cache_hash is not None and request_ok else None
+        return request_result, cache_entry
+
+    def _request_with_retries(self, method, url, params, data, headers, timeout):
+        """
+        Sends a request on the shared session, retrying connection errors, timeouts,
+        429 and 5xx responses with exponential backoff.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt fails.
+        """
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                response = _session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    timeout=timeout
+                )
+                response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+                return response
+            except requests.exceptions.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else 0
+                if attempt == MAX_ATTEMPTS - 1 or (status_code < 500 and status_code != 429):
+                    raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
 
     def run(self, requests_list):
         """
@@ -82,52 +139,37 @@ class SimpleBatchRequester:
             list: A list of dictionaries, with each dict containing the request index and its result.
         """
         results = [None] * len(requests_list)
-        failed_indices = set()
+        cache_entries = []
         
-        # Run initial batch
-        print(f"[BatchRequest] Starting initial batch of {len(requests_list)} requests.")
-        processed_results, newly_failed_indices = self._process_batch(requests_list)
-        for res in processed_results:
-            results[res['index']] = res
-        failed_indices.update(newly_failed_indices)
-
-        # Retry failed requests
-        if failed_indices:
-            failed_requests = [requests_list[i] for i in failed_indices]
-            print(f"[BatchRequest] Retrying {len(failed_indices)} failed requests with indices: {sorted(list(failed_indices))}")
-            
-            # We must re-map the indices for the retry.
-            # Create a mapping from the temporary retry index to the original index.
-            original_index_map = {i: original_idx for i, original_idx in enumerate(failed_indices)}
-            
-            retry_results = self._process_batch(failed_requests, original_index_map)
-            for res in retry_results[0]:
-                results[res['index']] = res
+        # Failed requests are retried inside each worker (see `_request_with_retries`)
+        print(f"[BatchRequest] Starting batch of {len(requests_list)} requests.")
+        self._process_batch(requests_list, results, cache_entries)
+
+        for cache_hash, request_result, cache_time in cache_entries:
+            cache_handler.set(cache_hash, request_result, ttl_s=cache_time)
 
         return results
 
-    def _process_batch(self, requests_list, original_index_map=None):
-        """Helper method to process a batch of requests."""
-        processed_results = []
-        failed_indices = set()
+    def _process_batch(self, requests_list, results, cache_entries):
+        """
+        Helper method to process a batch of requests.
+        Each result is stored in `results` at its index as soon as it completes,
+        results to cache are collected in `cache_entries`.
+        """
+        executor = self._get_pool()
+        future_to_index = {
+            executor.submit(self._worker, request_data, i): i
+            for i, request_data in enumerate(requests_list)
+        }
+        for future in concurrent.futures.as_completed(future_to_index):
+            index = future_to_index[future]
+            try:
+                result, cache_entry = future.result()
+                result['index'] = index # Cached results may come from another batch
+                results[index] = result
+                if cache_entry is not None:
+                    cache_entries.append(cache_entry)
+            except Exception as e:
+                # Unexpected errors leave the result as None
+                print(f"[BatchRequest] Error processing request for index {index}: {e}")
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_index = {
-                executor.submit(self._worker, request_data, i): i
-                for i, request_data in enumerate(requests_list)
-            }
-            for future in concurrent.futures.as_completed(future_to_index):
-                temp_index = future_to_index[future]
-                try:
-                    result = future.result()
-                    # If we're in a retry, use the original index map
-                    original_index = original_index_map.get(temp_index, temp_index) if original_index_map else temp_index
-                    result['index'] = original_index # Update the index in the result dict
-                    processed_results.append(result)
-                except Exception as e:
-                    # Log the error and add the original index to the failed set
-                    original_index = original_index_map.get(temp_index, temp_index) if original_index_map else temp_index
-                    print(f"[BatchRequest] Error processing request for original index {original_index}: {e}")
-                    failed_indices.add(original_index)
-                    
-        return processed_results, failed_indices
\ No newline at end of file
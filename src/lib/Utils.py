@@ -1,16 +1,112 @@
-import re
+import string
 import requests
-import json
+import orjson
 import hashlib
+import unicodedata
 
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta, tzinfo
+from functools import lru_cache
 
 from services.AppData import AppData
-from services.logger.Logger import _log
 
 # --- Configuration ---
-DATETIME_DISPLAY_FORMAT = AppData().get_config("datetime_display_format")
-TIME_DISPLAY_FORMAT = AppData().get_config("time_display_format")
+MIDNIGHT = time.min # Used to turn dates into datetimes
+TIME_SLUG_TABLE = str.maketrans("", "", ":-TZ")
+
+# Canonical JSON for `Utils.hash`: sorted keys, non-str keys written as strings (like json.dumps)
+HASH_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# Characters a JSON document can start with (after whitespace)
+JSON_FIRST_CHARS = frozenset('{["tfn-0123456789')
+
+# `format` names accepted by the date string helpers, any other value is used as a strftime format
+# ("display" is read from the config on first use, see `_datetime_display_format`)
+DATE_STRING_FORMATS = {
+    "": "%Y-%m-%dT%H:%M:%SZ", # iso
+    "iso_date_only": "%Y-%m-%d",
+}
+
+# Slugify table for ASCII text, built once: spaces become hyphens, anything other than
+# letters, numbers and hyphens is removed
+SLUG_TRANSLATE_TABLE = {
+    **dict.fromkeys(range(128)),
+    **{ord(char): char for char in string.ascii_lowercase + string.digits + "-"},
+    ord(" "): "-",
+}
+
+@lru_cache(maxsize=1)
+def _datetime_display_format() -> str:
+    """
+    The 'datetime_display_format' config value, read on first use instead of at import.
+    """
+    return AppData().get_config("datetime_display_format")
+
+@lru_cache(maxsize=1)
+def _time_display_format() -> str:
+    """
+    The 'time_display_format' config value, read on first use instead of at import.
+    """
+    return AppData().get_config("time_display_format")
+
+@lru_cache(maxsize=8192)
+def _parse_datetime(value: str, parse_format: str = "") -> datetime:
+    """
+    Parses a date string (iso format by default), memoized since the same strings are parsed over and over.
+    """
+    if parse_format == "":
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, parse_format)
+
+@lru_cache(maxsize=4096)
+def _format_datetime(value: datetime | time, format: str, tz: tzinfo | None = None) -> str:
+    """
+    Formats a datetime/time with strftime, memoized for repeated values (e.g. table rows).
+    `tz` (the value's tzinfo) is part of the key: aware values in different zones compare equal but format differently.
+    """
+    return value.strftime(format)
+
+def _is_iso_shaped(value: str) -> bool:
+    """
+    Whether a string starts like an iso date (YYYY-MM-DD), without parsing it.
+    """
+    return len(value) >= 10 and value[4] == "-" and value[7] == "-"
+
+def _string_to_datetime(value: str, parse_format: str = "") -> datetime:
+    """
+    `Utils.to_datetime` for strings: iso format (or `parse_format`), falling back to the 'datetime_display_format' config format.
+    Without `parse_format`, the format matching the string's shape is tried first, so display formatted dates
+    don't raise and unwind a ValueError first. The other one is still tried if it fails (e.g. compact iso strings).
+    """
+    if parse_format:
+        formats = (parse_format, _datetime_display_format())
+    elif _is_iso_shaped(value):
+        formats = ("", _datetime_display_format())
+    else:
+        formats = (_datetime_display_format(), "")
+
+    try:
+        return _parse_datetime(value, formats[0])
+    except ValueError:
+        return _parse_datetime(value, formats[1])
+
+# `Utils.to_datetime` conversions by input type, datetime before date since it is a date subclass
+TO_DATETIME_HANDLERS = {
+    datetime: lambda value, parse_format: value,
+    int: lambda value, parse_format: datetime.fromtimestamp(value),
+    float: lambda value, parse_format: datetime.fromtimestamp(value),
+    str: _string_to_datetime,
+    date: lambda value, parse_format: datetime.combine(value, MIDNIGHT),
+}
+
+def _datetime_to_string(value: datetime, format: str = "") -> str:
+    """
+    `Utils.to_date_string` for values already known to be datetimes.
+    """
+    if format == "display":
+        format = _datetime_display_format()
+    else:
+        format = DATE_STRING_FORMATS.get(format, format)
+    return _format_datetime(value, format, value.tzinfo)
 
 class Utils:
     
@@ -19,13 +115,14 @@ class Utils:
     # --------------------------
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def slugify(string: str) -> str:
         """
         Convert a given string to a URL-friendly 'slug'.
 
         Steps:
-        - Convert to lowercase and replace spaces with hyphens.
-        - Replace accented characters with ASCII equivalents.
+        - Convert to lowercase and replace accented characters with ASCII equivalents (any diacritic).
+        - Replace spaces with hyphens.
         - Remove non-alphanumeric characters, keeping only letters, numbers, and hyphens.
         - Remove leading/trailing hyphens and reduce multiple hyphens to one.
 
@@ -35,30 +132,14 @@ class Utils:
         Returns:
             str: Slugified version of the input string.
         """
-        # Convert to lowercase and replace spaces with hyphens
-        slug = string.lower().replace(" ", "-")
-
-        # Replace accented characters with their ASCII equivalents
-        accents_mapping = {
-            r"[àáâãäå]": "a",
-            r"[èéêë]": "e",
-            r"[ìíîï]": "i",
-            r"[òóôõö]": "o",
-            r"[ùúûü]": "u",
-            r"[ñ]": "n",
-            r"[ç]": "c",
-        }
-        for pattern, replacement in accents_mapping.items():
-            slug = re.sub(pattern, replacement, slug)
-
-        # Remove any characters that are not alphanumeric or hyphens
-        slug = re.sub(r"[^a-z0-9-]", "", slug)
-
-        # Reduce consecutive hyphens to a single hyphen
-        slug = re.sub(r"-+", "-", slug)
-
-        # Strip hyphens from the beginning and end of the string
-        return slug.strip("-")
+        # Convert to lowercase and split accented characters into letter + accent, keeping only the ASCII letter
+        slug = unicodedata.normalize("NFKD", string.lower()).encode("ascii", "ignore").decode("ascii")
+
+        # Replace spaces with hyphens and remove any characters that are not alphanumeric or hyphens
+        slug = slug.translate(SLUG_TRANSLATE_TABLE)
+
+        # Reduce consecutive hyphens to a single hyphen, dropping them from both ends
+        return "-".join(filter(None, slug.split("-")))
 
     @staticmethod
     def time_slugify(time) -> str:
@@ -72,7 +153,7 @@ class Utils:
             str: The slugified datetime string.
         """
         formatted = Utils.formatted_date(time)
-        return "T" + formatted.replace(":", "").replace("-", "").replace("T", "").replace("Z", "").lower()
+        return "T" + formatted.translate(TIME_SLUG_TABLE).lower()
 
     @staticmethod
     def url_encode(text: str) -> str:
@@ -97,20 +178,27 @@ class Utils:
     # --------------------------
         
     @staticmethod
-    def is_json(data: str) -> bool:
+    def is_json(data: str | bytes) -> bool:
         """
         Check if a given string is valid JSON.
 
         Args:
-            data (str): The string to check.
+            data (str | bytes): The string to check, bytes (e.g. a response body) are accepted too.
 
         Returns:
             bool: True if the string is valid JSON, False otherwise.
         """
+        # Most non-JSON strings can be rejected by their first character, without raising
+        stripped = data.lstrip()
+        first_char = stripped[:1]
+        if not isinstance(first_char, str):
+            first_char = first_char.decode("latin-1")
+        if not first_char or first_char not in JSON_FIRST_CHARS:
+            return False
         try:
-            json.loads(data)
+            orjson.loads(stripped)
             return True
-        except ValueError:
+        except orjson.JSONDecodeError:
             return False
 
     @staticmethod
@@ -126,29 +214,29 @@ class Utils:
         Returns:
             str: Flattened string representation.
         """
-        items = []
-
         if isinstance(cell, dict):
-            for k, v in cell.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, (dict, list)):
-                    items.append(Utils.flatten_json_to_string(v, new_key, sep))
-                else:
-                    items.append(f"{new_key}: {v}")
+            return ", ".join(Utils._flatten_json_pairs(cell, parent_key, sep))
 
         elif isinstance(cell, list):
-            groups = []
-            for item in cell:
-                if isinstance(item, dict):
-                    groups.append(flatten_json_to_string(item, parent_key, sep))
-                else:
-                    groups.append(str(item))
-            return ", ".join(groups)
+            return ", ".join(
+                Utils.flatten_json_to_string(item, parent_key, sep) if isinstance(item, dict) else str(item)
+                for item in cell
+            )
 
         else:
             return f"{parent_key}: {cell}" if parent_key else str(cell)
 
-        return ", ".join(items)
+    @staticmethod
+    def _flatten_json_pairs(cell: dict, parent_key: str, sep: str):
+        """
+        Yield the flattened 'key: value' strings of a dict (see `flatten_json_to_string`).
+        """
+        for k, v in cell.items():
+            new_key = f"{parent_key}{sep}{k}" if parent_key else k
+            if isinstance(v, (dict, list)):
+                yield Utils.flatten_json_to_string(v, new_key, sep)
+            else:
+                yield f"{new_key}: {v}"
 
 
     # --------------------------
@@ -182,7 +270,8 @@ class Utils:
         if delta_seconds:
             _date += timedelta(seconds=delta_seconds)
 
-        return Utils.to_date_string(_date, format=format)
+        # Already a datetime, skip the conversions in `to_date_string`
+        return _datetime_to_string(_date, format)
 
     @staticmethod
     def to_date_string(_date: date | datetime | str | int, format="") -> str:
@@ -197,7 +286,7 @@ class Utils:
         """ 
         # Convert string to datetime object from isoformat
         if isinstance(_date, str):
-            _date = datetime.fromisoformat(_date)
+            _date = _parse_datetime(_date)
 
         # If it's an int, convert to datetime (assuming it's a timestamp)
         if isinstance(_date, int):
@@ -205,16 +294,9 @@ class Utils:
 
         # If it's a date (not datetime), convert to datetime at midnight
         if isinstance(_date, date) and not isinstance(_date, datetime):
-            _date = datetime.combine(_date, datetime.min.time())
+            _date = datetime.combine(_date, MIDNIGHT)
 
-        if format == "display":
-            return _date.strftime(DATETIME_DISPLAY_FORMAT)
-        elif format == "iso_date_only":
-            return _date.strftime("%Y-%m-%d")
-        elif format != "":
-            return _date.strftime(format)
-        else: # iso
-            return _date.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return _datetime_to_string(_date, format)
 
     @staticmethod
     def to_date_string_recursive(items: list | dict, format="") -> list | dict:
@@ -229,20 +311,27 @@ class Utils:
             (list | dict): The list or dictionary with date or datetime objects converted to strings.
         """
         # Ignore objects that are not lists or dictionaries
-        if not (isinstance(items, list) or isinstance(items, dict)):
+        if not isinstance(items, (list, dict)):
             return items
 
-        for item in items:
-            if isinstance(item, dict) or isinstance(item, list):
-                item = Utils.to_date_string_recursive(items=item, format=format)
-            else:
+        # Walk nested containers with an explicit stack, so deep data doesn't hit the recursion limit
+        stack = [items]
+        while stack:
+            container = stack.pop()
+            entries = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in entries:
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+
                 # Convert date objects to strings
-                if isinstance(items[item], datetime) or isinstance(items[item], date):
-                    items[item] = Utils.to_date_string(items[item], format=format)
+                elif isinstance(value, datetime):
+                    container[key] = _datetime_to_string(value, format)
+                elif isinstance(value, date):
+                    container[key] = Utils.to_date_string(value, format=format)
 
                 # Convert time objects to strings
-                if "datetime.time" in str(type(items[item])):
-                    items[item] = Utils.to_time_string(items[item])
+                elif isinstance(value, time):
+                    container[key] = Utils.to_time_string(value)
         return items
 
     @staticmethod
@@ -260,9 +349,9 @@ class Utils:
         """
         # Convert string to datetime object from isoformat
         if isinstance(_time, str):
-            _time = datetime.fromisoformat(_time)
+            _time = _parse_datetime(_time)
 
-        return str(_time.strftime(TIME_DISPLAY_FORMAT))
+        return _format_datetime(_time, _time_display_format(), _time.tzinfo)
 
     @staticmethod
     def to_datetime(_date: str | date | datetime | int, parse_format: str = "") -> datetime:
@@ -278,32 +367,17 @@ class Utils:
         Returns:
             datetime: The datetime object.
         """
-        # If already a datetime object, return as is
-        if isinstance(_date, datetime):
-            return _date
-        
-        # If it's an integer, convert it to a datetime object
-        if isinstance(_date, int):
-            return datetime.fromtimestamp(_date)
+        handler = TO_DATETIME_HANDLERS.get(type(_date))
 
-        # Attempt to convert from isoformat
-        try:
-            if isinstance(_date, str):
-                if parse_format == "":
-                    _date = datetime.fromisoformat(_date)
-                else:
-                    _date = datetime.strptime(_date, parse_format)
-
-            elif isinstance(_date, date):
-                _date = datetime.combine(_date, datetime.min.time())
-
-        # Attempt to convert from display format
-        except ValueError:
-            _date = datetime.strptime(
-                str(_date), DATETIME_DISPLAY_FORMAT
-            )
+        # Subclasses (e.g. bool, pd.Timestamp) use the handler of the first type they match
+        if handler is None:
+            handler = next((h for _type, h in TO_DATETIME_HANDLERS.items() if isinstance(_date, _type)), None)
+
+            # Anything else is returned as is
+            if handler is None:
+                return _date
 
-        return _date
+        return handler(_date, parse_format)
     
     @staticmethod
     def get_days_since(_date: str | date | datetime | int, parse_format: str = "") -> int:
@@ -315,12 +389,12 @@ class Utils:
             parse_format (str, optional): The format to use for parsing the date. Defaults to "".
 
         Returns:
-            int: The number of days since the given date.
+            int: The number of calendar days since the given date.
         """
-        date = Utils.to_datetime(_date, parse_format=parse_format)
-        if not date:
+        _datetime = Utils.to_datetime(_date, parse_format=parse_format)
+        if not _datetime:
             return 0
-        return (datetime.now() - date).days
+        return date.today().toordinal() - _datetime.toordinal()
 
     # --------------------------
     # Hash Utils
@@ -329,7 +403,8 @@ class Utils:
     @staticmethod
     def hash(input):
         """
-        Hashes the input using SHA-256, supporting various data types.
+        Hashes the input using BLAKE2b (32-byte digest), supporting various data types.
+        Meant for cache keys and ids, not for anything security related.
         
         The function serializes the input (string, object, list, or dict)
         into a consistent JSON string before hashing.
@@ -345,18 +420,18 @@ class Utils:
             # Already a string, just encode it
             data_to_hash = input.encode('utf-8')
         elif isinstance(input, (list, dict)):
-            # For lists and dictionaries, serialize them to a canonical JSON string
-            # using sort_keys=True to ensure consistent hashing regardless of order.
-            data_to_hash = json.dumps(input, sort_keys=True).encode('utf-8')
+            # For lists and dictionaries, serialize them to canonical JSON bytes
+            # with sorted keys to ensure consistent hashing regardless of order.
+            data_to_hash = orjson.dumps(input, option=HASH_ORJSON_OPTIONS)
         else:
             # For other JSON-serializable objects (like ints, floats, booleans)
             # or for simple objects, convert to a string and encode.
             try:
-                data_to_hash = json.dumps(input).encode('utf-8')
+                data_to_hash = orjson.dumps(input, option=HASH_ORJSON_OPTIONS)
             except TypeError:
                 # Fallback for non-JSON-serializable objects. This might not
                 # produce consistent hashes for complex, un-serializable objects.
                 data_to_hash = str(input).encode('utf-8')
 
-        # Create the SHA-256 hash object and return the hexdigest
-        return hashlib.sha256(data_to_hash).hexdigest()
+        # Create the BLAKE2b hash object and return the hexdigest (64 characters, as with SHA-256)
+        return hashlib.blake2b(data_to_hash, digest_size=32).hexdigest()
@@ -1,7 +1,8 @@
 import streamlit as st
 import json
+import asyncio
 import pandas as pd
-import matplotlib.pyplot as plt
+from types import MappingProxyType
 
 from dotenv import load_dotenv, find_dotenv
 
@@ -17,14 +18,55 @@ from services.CoinTrainingDataPrep import CoinTrainingDataPrep
 # Load environment variables
 load_dotenv(find_dotenv("../.env"))
 
+# Static addresses for testing
+STATIC_ADDRESSES = MappingProxyType({
+    "BILLY": {
+        "mint": "3B5wuUrMEi5yATD7on46hKfej3pfmd7t1RKgrsN3pump",
+        "pair": "9uWW4C36HiCTGr6pZW9VFhr9vdXktZ8NA8jVnzQU35pJ"
+    },
+    "PENGU": {
+        "mint": "2zMMhcVQEXDtdE6vsFS7S7D5oUodfJHE8vd1gnBouauv",
+        "pair": "C6ELogyx2aAd4FfMS9YcVQ284sPvD454hNaFGj7WFYYh"
+    }
+})
+
+# --------------------------
+# Cached Data
+# ---------------------------
+
+@st.cache_resource(show_spinner=False)
+def _get_services() -> tuple[AppData, SolanaTokenSummary]:
+    # Long-lived clients, so their HTTP sessions keep pooled connections across reruns
+    return AppData(), SolanaTokenSummary()
+
+# Streamlit reruns the whole script on every interaction, so provider data is kept
+# per (token, pair) for a short while. SolanaTokenSummary is safe to share across concurrent
+# runs, BitQuerySolana isn't (IS_QUERYING guard), so each of its calls gets its own client.
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_token_summary_df(token: str, pair_address: str) -> pd.DataFrame:
+    return _get_services()[1].get_token_summary_df(token, pair_address)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_token_pair_24h_summary_df(token: str, pair_address: str) -> pd.DataFrame:
+    return BitQuerySolana().get_token_pair_24h_summary_df(token, pair_address)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_recent_pair_tx_df(token: str, pair_address: str) -> pd.DataFrame:
+    # Display only, so hand Streamlit arrow-backed columns it can serialize without conversion
+    df = BitQuerySolana().get_recent_pair_tx_df(token, pair_address)
+    return df.convert_dtypes(dtype_backend="pyarrow", convert_integer=False)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _get_latest_tokens(platform: str, min_liquidity: float, limit: int) -> list:
+    return BitQuerySolana().get_latest_tokens(platform=platform, min_liquidity=min_liquidity, limit=limit)
+
 # --------------------------
 # Page
 # ---------------------------
 def Page():
     
-    app_data = AppData()
-    bitquery = BitQuerySolana()
-    solana = SolanaTokenSummary()
+    app_data, solana = _get_services()
 
     # Set page title
     st.set_page_config(page_title="Home", page_icon="🐸", layout="wide")
@@ -36,6 +78,7 @@ def Page():
     with col_refresh:
         st.write("######")
         if st.button("Refresh", use_container_width=True):
+            _get_latest_tokens.clear()
             app_data.clear_state("latest_tokens")
             app_data.clear_state("custom_pair_address")
 
@@ -44,53 +87,37 @@ def Page():
         coins = app_data.get_state("latest_tokens")
         if not coins:
             coins = {}
-            meme_coins = bitquery.get_latest_tokens(platform="pump.fun", min_liquidity=10000, limit=20)
-
-            # Filter for "best" coins
-            best_coins = {}
-            for coin in meme_coins:
-                details = coin["Pool"]
-                base = details['Market']['BaseCurrency']
-                mint = base['MintAddress']
-                post_amount = float(details['Base']['PostAmount'])
-
-                # If mint not seen yet, or current has higher PostAmount, update it
-                if mint not in best_coins or post_amount > best_coins[mint]['post_amount']:
-                    best_coins[mint] = {
-                        "name": base['Name'],
-                        "symbol": base['Symbol'],
-                        "mint": mint,
-                        "pair": details['Market']['MarketAddress'],
-                        "post_amount": post_amount
-                    }
-
-            # Build final dict for session state
-            for mint, data in best_coins.items():
-                coins[data["name"] + " (" + data["symbol"] + ")"] = {
-                    "mint": data["mint"],
-                    "pair": data["pair"]
+            meme_coins = _get_latest_tokens("pump.fun", 10000, 20)
+
+            # Filter for "best" coins (highest PostAmount per mint)
+            if meme_coins:
+                df_coins = pd.json_normalize(meme_coins, sep="_").rename(columns={
+                    "Pool_Market_BaseCurrency_MintAddress": "mint",
+                    "Pool_Market_BaseCurrency_Name": "name",
+                    "Pool_Market_BaseCurrency_Symbol": "symbol",
+                    "Pool_Market_MarketAddress": "pair",
+                })
+                df_coins["post_amount"] = pd.to_numeric(df_coins["Pool_Base_PostAmount"])
+                best_coins = df_coins.loc[df_coins.groupby("mint", sort=False)["post_amount"].idxmax()]
+
+                # Build final dict for session state
+                coins = {
+                    f"{data.name} ({data.symbol})": {"mint": data.mint, "pair": data.pair}
+                    for data in best_coins.itertuples(index=False)
                 }
             app_data.set_state("latest_tokens", coins, ttl=60)
 
-        # Static addresses for testing
-        addresses = {
-            "BILLY": {
-                "mint": "3B5wuUrMEi5yATD7on46hKfej3pfmd7t1RKgrsN3pump",
-                "pair": "9uWW4C36HiCTGr6pZW9VFhr9vdXktZ8NA8jVnzQU35pJ"
-            },
-            "PENGU": {
-                "mint": "2zMMhcVQEXDtdE6vsFS7S7D5oUodfJHE8vd1gnBouauv",
-                "pair": "C6ELogyx2aAd4FfMS9YcVQ284sPvD454hNaFGj7WFYYh"
-            }
-        }
-
-        # Merge with existing addresses
-        addresses.update(coins)
+        # Merge the static addresses with the latest coins
+        addresses = {**STATIC_ADDRESSES, **coins}
 
         # Add coin selector
         current_latest_token = app_data.get_state("current_latest_token")
-        index = list(addresses.keys()).index(current_latest_token) if current_latest_token in addresses else 0
-        current_latest_token = st.selectbox("Select a token", options=list(addresses.keys()), index=index)
+        token_options = tuple(addresses)
+        try:
+            index = token_options.index(current_latest_token)
+        except ValueError:
+            index = 0
+        current_latest_token = st.selectbox("Select a token", options=token_options, index=index)
         app_data.set_state("current_latest_token", current_latest_token)
 
     sep.write()
@@ -109,7 +136,15 @@ def Page():
         st.error("Token or Pair address is missing or invalid.")
         return
     
-    df_sol_summary = solana.get_token_summary_df(token, pair_address)
+    # Fetch the independent sources concurrently (network bound)
+    async def _load():
+        return await asyncio.gather(
+            asyncio.to_thread(_get_token_summary_df, token, pair_address),
+            asyncio.to_thread(_get_token_pair_24h_summary_df, token, pair_address),
+            asyncio.to_thread(_get_recent_pair_tx_df, token, pair_address),
+        )
+
+    df_sol_summary, df_bitquery_summary, df_bitquery_recent_transactions = asyncio.run(_load())
     if df_sol_summary.empty:
         st.error("Unable to retrieve token summary.")
         return
@@ -118,33 +153,29 @@ def Page():
     st.markdown(f"# ℹ️ Token Overview: {token_name}")
 
     st.markdown("### Token Summary (Aggregated Sources)")
-    # Convert any json cells to string
-    df_sol_summary = df_sol_summary.map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+    # Convert any json cells to string (only object columns can hold them)
+    for col in df_sol_summary.select_dtypes(include="object").columns:
+        df_sol_summary[col] = df_sol_summary[col].map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
 
     st.dataframe(df_sol_summary.T.rename_axis("Agg Token Summary"), use_container_width=True)
 
     st.markdown("### Token Summary (BitQuery)")
-    df_bitquery_summary = bitquery.get_token_pair_24h_summary_df(token, pair_address)
     st.dataframe(df_bitquery_summary.T.rename_axis("BitQuery Summary"), use_container_width=True)
 
     st.markdown("### Recent Trades (BitQuery)")
-    df_bitquery_recent_transactions = bitquery.get_recent_pair_tx_df(token, pair_address)
     st.dataframe(df_bitquery_recent_transactions, use_container_width=True)
 
     st.markdown("### Raw Training DataFrame")
 
+    # Runs after the gather above so the summary and trades come from the local cache
     df_raw_training_data = CoinTrainingDataPrep().get_raw_pair_training_data(token, pair_address)
     st.dataframe(df_raw_training_data, use_container_width=True)
     
     
-  # Convert numeric cols
-    num_cols = ["bq_trade_amount_token", "bq_trade_priceinusd", "bq_transaction_feeinusd", "bq_mc_usd", "context_be_token_price_usd", "context_be_token_total_supply", "context_be_creator_net_worth_usd", "context_be_token_holders", "context_be_top10_holder_percentage", "context_be_liquidity_pool_usd", "context_dex_mc_usd"]
-    for col in num_cols:
-        if col in df_raw_training_data.columns:
-            df_raw_training_data[col] = pd.to_numeric(df_raw_training_data[col], errors="coerce")
+    # Numeric columns are already typed by CoinTrainingDataPrep
 
     # Add trade value USD
-    df_raw_training_data["trade_value_usd"] = df_raw_training_data["bq_trade_amount_token"] * df_raw_training_data["bq_trade_priceinusd"]
+    df_raw_training_data["trade_value_usd"] = df_raw_training_data.eval("bq_trade_amount_token * bq_trade_priceinusd")
 
     # ---- HEADER ----
     st.markdown("# 📊 Token Analysis")
@@ -171,12 +202,19 @@ def Page():
 
     # ---- KPIs ----
     st.subheader("Trading KPIs")
+    kpis = df_raw_training_data.agg({
+        "bq_trade_amount_token": ["sum", "mean"],
+        "trade_value_usd": "sum",
+        "bq_transaction_feeinusd": "sum",
+    })
+    # One pass over the makers serves both the unique count and the top traders chart
+    trader_volume_usd = df_raw_training_data.groupby("bq_transaction_maker", sort=False)["trade_value_usd"].sum()
     total_trades = len(df_raw_training_data)
-    total_volume_token = df_raw_training_data["bq_trade_amount_token"].sum()
-    total_volume_usd = df_raw_training_data["trade_value_usd"].sum()
-    avg_trade_size = df_raw_training_data["bq_trade_amount_token"].mean()
-    total_fees_usd = df_raw_training_data["bq_transaction_feeinusd"].sum()
-    unique_traders = df_raw_training_data["bq_transaction_maker"].nunique()
+    total_volume_token = kpis.at["sum", "bq_trade_amount_token"]
+    total_volume_usd = kpis.at["sum", "trade_value_usd"]
+    avg_trade_size = kpis.at["mean", "bq_trade_amount_token"]
+    total_fees_usd = kpis.at["sum", "bq_transaction_feeinusd"]
+    unique_traders = len(trader_volume_usd)
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Trades", f"{total_trades:,}")
@@ -191,18 +229,21 @@ def Page():
     st.markdown("---")
 
     # ---- CHARTS ----
+    # Index by block time once, both time series charts reuse it
+    df_time_series = df_raw_training_data.set_index("bq_block_time").sort_index()
+
     st.subheader("Price Over Time (USD)")
-    st.line_chart(df_raw_training_data.set_index("bq_block_time")["bq_trade_priceinusd"])
+    st.line_chart(df_time_series["bq_trade_priceinusd"])
 
     st.subheader("Trade Volume Over Time (USD)")
-    volume_time = df_raw_training_data.groupby(pd.Grouper(key="bq_block_time", freq="1min"))["trade_value_usd"].sum()
+    volume_time = df_time_series["trade_value_usd"].resample("1min").sum()
     st.line_chart(volume_time)
 
     st.subheader("Buy vs Sell Distribution")
     st.bar_chart(df_raw_training_data["bq_trade_side_type"].value_counts())
 
     st.subheader("Top 10 Traders by Volume (USD)")
-    top_traders = df_raw_training_data.groupby("bq_transaction_maker")["trade_value_usd"].sum().nlargest(10)
+    top_traders = trader_volume_usd.nlargest(10)
     st.bar_chart(top_traders)
 
 
@@ -1,7 +1,6 @@
 import streamlit as st
 import json
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from dotenv import load_dotenv, find_dotenv
 
@@ -17,12 +16,63 @@ from services.CoinTrainingDataPrep import CoinTrainingDataPrep
 # Load environment variables
 load_dotenv(find_dotenv("../.env"))
 
+# Wallet / pair addresses repeat across many rows, as categoricals they're grouped by integer codes
+CATEGORICAL_COLUMNS = ("context_pair_address", "context_be_creator_address", "bq_transaction_maker")
+
+# --------------------------
+# Cached Data
+# ---------------------------
+
+# Streamlit reruns the whole script on every interaction (e.g. each slider move), so the
+# datasets and their metrics are kept until they expire or the page is refreshed.
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _get_raw_training_df(pair_address: str, filename: str) -> pd.DataFrame:
+    return CoinTrainingDataPrep().get_raw_training_df(pair_address, filename)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _get_combined_df(datasets: tuple[tuple[str, str], ...]) -> pd.DataFrame:
+    dataframes = [_get_raw_training_df(pair_address, filename) for pair_address, filename in datasets]
+    if not dataframes:
+        return pd.DataFrame()
+    combined_df = pd.concat(dataframes, ignore_index=True).drop_duplicates()
+    return combined_df.astype(dict.fromkeys(CATEGORICAL_COLUMNS, "category"))
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _compute_metrics(datasets: tuple[tuple[str, str], ...], market_cap_range: tuple[float, float], _combined_df: pd.DataFrame) -> dict:
+    # `_combined_df` isn't hashed, it's fully determined by the datasets and the market cap range
+    return compute_metrics(_combined_df)
+
 # --------------------------
 # Features
 # ---------------------------
 
+# Per pool and per dev aggregations used by `compute_metrics`, each computed in a single groupby
+POOL_AGGREGATIONS = {
+    "context_ss_creator_pools_created": "max",
+    "context_be_liquidity_pool_usd": "max",
+    "bq_mc_usd": "max",
+    "context_be_pool_creation_time": "min",
+    # Security
+    "context_rc_is_freezable": "first",
+    "context_rc_mint_authority": "first",
+    "context_rc_is_liquidity_locked": "first",
+    "context_be_mutable_metadata": "first",
+    "context_be_non_transferable": "first",
+    "context_be_has_transfer_tax": "first",
+    "context_rc_risk_score": "first",
+    "context_be_metadata": "first",
+}
+DEV_AGGREGATIONS = {
+    "context_ss_creator_wallet_age_days": "max",
+    "context_be_creator_net_worth_usd": "max",
+}
+
 def compute_metrics(combined_df):
     metrics = {}
+
+    pool_agg = combined_df.groupby("context_pair_address", sort=False, observed=True).agg(POOL_AGGREGATIONS)
+    dev_agg = combined_df.groupby("context_be_creator_address", sort=False, observed=True).agg(DEV_AGGREGATIONS)
     
     # --------------------------
     # DEV
@@ -33,46 +83,43 @@ def compute_metrics(combined_df):
     metrics["number_of_dev_wallets"] = len(devs)
 
     # Dev token count
-    dev_agg_pools = combined_df.groupby("context_pair_address")["context_ss_creator_pools_created"].max()
+    dev_agg_pools = pool_agg["context_ss_creator_pools_created"]
     metrics["dev_avg_pools_created"] = dev_agg_pools.mean()
     metrics["dev_total_pools_created"] = dev_agg_pools.sum()
     metrics["dev_min_pools_created"] = dev_agg_pools.min()
     metrics["dev_max_pools_created"] = dev_agg_pools.max()
 
     # Dev wallet age
-    dev_agg_age = combined_df.groupby("context_be_creator_address")["context_ss_creator_wallet_age_days"].max()
+    dev_agg_age = dev_agg["context_ss_creator_wallet_age_days"]
     metrics["dev_avg_wallet_age"] = dev_agg_age.mean()
     metrics["dev_min_wallet_age"] = dev_agg_age.min()
     metrics["dev_max_wallet_age"] = dev_agg_age.max()
 
     # Dev net worth
-    dev_agg_net_worth = combined_df.groupby("context_be_creator_address")["context_be_creator_net_worth_usd"].max()
+    dev_agg_net_worth = dev_agg["context_be_creator_net_worth_usd"]
     metrics["dev_avg_net_worth"] = dev_agg_net_worth.mean()
     metrics["dev_min_net_worth"] = dev_agg_net_worth.min()
     metrics["dev_max_net_worth"] = dev_agg_net_worth.max()
 
     # Dev buy/sell amounts
     dev_trades = combined_df[combined_df["bq_transaction_maker"].isin(devs)]
-    dev_buy_amount = dev_trades[dev_trades["bq_trade_side_type"] == "buy"]["bq_trade_side_amount"].sum()
-    dev_sell_amount = dev_trades[dev_trades["bq_trade_side_type"] == "sell"]["bq_trade_side_amount"].sum()
-    metrics["dev_bought_amount"] = dev_buy_amount
-    metrics["dev_sold_amount"] = dev_sell_amount
+    dev_side_amounts = dev_trades.groupby("bq_trade_side_type", sort=False, observed=True)["bq_trade_side_amount"].sum()
+    metrics["dev_bought_amount"] = dev_side_amounts.get("buy", 0)
+    metrics["dev_sold_amount"] = dev_side_amounts.get("sell", 0)
 
     # --------------------------
     # TX
     # --------------------------
 
-    # Fastest & avg transaction time
-    combined_df["bq_block_time"] = pd.to_datetime(combined_df["bq_block_time"])
-    combined_df["context_be_token_creation_time"] = pd.to_datetime(combined_df["context_be_token_creation_time"])
-    combined_df["tx_delay"] = (combined_df["bq_block_time"] - combined_df["context_be_token_creation_time"]).dt.total_seconds()
+    # Fastest & avg transaction time (datetime columns are parsed when the datasets are loaded)
+    tx_delay = (combined_df["bq_block_time"] - combined_df["context_be_token_creation_time"]).dt.total_seconds()
 
     metrics['tx_total_buys'] = (combined_df["bq_trade_side_type"] == "buy").sum()
     metrics['tx_total_sells'] = (combined_df["bq_trade_side_type"] == "sell").sum()
 
     metrics['tx_unique_wallets'] = combined_df["bq_transaction_maker"].nunique()
-    metrics["tx_fastest_tx_time"] = combined_df["tx_delay"].min()
-    metrics["tx_avg_block_time"] = combined_df["tx_delay"].mean()
+    metrics["tx_fastest_tx_time"] = tx_delay.min()
+    metrics["tx_avg_block_time"] = tx_delay.mean()
     metrics["tx_avg_amount_side"] = combined_df["bq_trade_side_amount"].mean()
     metrics["tx_avg_wallet_age_days"] = combined_df["bq_transaction_maker_age_days"].mean()
     metrics["tx_min_wallet_age_days"] = combined_df["bq_transaction_maker_age_days"].min()
@@ -86,21 +133,21 @@ def compute_metrics(combined_df):
     metrics["how_many_pools"] = combined_df["context_pair_address"].nunique()
 
     # Pool Age in Minutes
-    age_agg = combined_df.groupby("context_pair_address")["context_be_pool_creation_time"].min()
-    pool_age_minutes = (pd.to_datetime("now", utc=True) - age_agg).dt.total_seconds() / 60
+    age_agg = pool_agg["context_be_pool_creation_time"]
+    pool_age_minutes = (pd.Timestamp.now(tz="UTC") - age_agg).dt.total_seconds() / 60
     metrics["pool_avg_age_mins"] = pool_age_minutes.mean()
     metrics["pool_min_age_mins"] = pool_age_minutes.min()
     metrics["pool_max_age_mins"] = pool_age_minutes.max()
 
     # Liquidity
-    lp_agg_df = combined_df.groupby("context_pair_address")["context_be_liquidity_pool_usd"].max()
+    lp_agg_df = pool_agg["context_be_liquidity_pool_usd"]
     metrics["lp_total_usd"] = lp_agg_df.sum()
     metrics["lp_avg_usd"] = lp_agg_df.mean()
     metrics["lp_min_usd"] = lp_agg_df.min()
     metrics["lp_max_usd"] = lp_agg_df.max()
     
     # Market Cap
-    mc_agg_df = combined_df.groupby("context_pair_address")["bq_mc_usd"].max()
+    mc_agg_df = pool_agg["bq_mc_usd"]
     metrics["mc_total_usd"] = mc_agg_df.sum()
     metrics["mc_avg_usd"] = mc_agg_df.mean()
     metrics["mc_min_usd"] = mc_agg_df.min()
@@ -113,7 +160,7 @@ def compute_metrics(combined_df):
     # --------------------------
     # Security
     # --------------------------
-    sec_agg = combined_df.groupby("context_pair_address").first()
+    sec_agg = pool_agg
     metrics["freezable_tokens"] = sec_agg["context_rc_is_freezable"].sum()
     metrics["no_mint"] = (sec_agg["context_rc_mint_authority"] == False).sum()
     metrics["lp_locked"] = (sec_agg["context_rc_is_liquidity_locked"] == True).sum()
@@ -152,6 +199,11 @@ def Page():
     
     st.title("🐸 Dataset Comparer")
 
+    if st.button("Refresh"):
+        _get_raw_training_df.clear()
+        _get_combined_df.clear()
+        _compute_metrics.clear()
+
     available_datasets = ct_data.list_available_raw_training_metadata()
 
     # Select Specific Datasets
@@ -165,15 +217,10 @@ def Page():
     else:
         matched_datasets = available_datasets
         
-    # Retrieve the DataFrames for the matched datasets
-    matched_dataframes = []
-    for dataset in matched_datasets:
-        df = ct_data.get_raw_training_df(dataset["pair_address"], dataset["filename"])
-        matched_dataframes.append(df)
-
-    # Combine all matched DataFrames into a single DataFrame
-    if matched_dataframes:
-        combined_df = pd.concat(matched_dataframes, ignore_index=True).drop_duplicates()
+    # Retrieve and combine the DataFrames for the matched datasets
+    datasets = tuple(sorted((dataset["pair_address"], dataset["filename"]) for dataset in matched_datasets))
+    if datasets:
+        combined_df = _get_combined_df(datasets)
         st.write("Retrieved Data:")
         st.dataframe(combined_df)
     else:
@@ -194,7 +241,7 @@ def Page():
     
     st.write("---")
     # Compute insights
-    metrics = compute_metrics(combined_df)
+    metrics = _compute_metrics(datasets, market_cap_range, combined_df)
 
     # Display in columns
     total_coins = combined_df['context_pair_address'].nunique()
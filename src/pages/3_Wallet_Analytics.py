@@ -1,7 +1,6 @@
 import streamlit as st
 import json
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from dotenv import load_dotenv, find_dotenv
 
@@ -18,6 +17,34 @@ from services.CoinTrainingDataPrep import CoinTrainingDataPrep
 # Load environment variables
 load_dotenv(find_dotenv("../.env"))
 
+# Token metadata kept for the analysis, see SolanaTokenSummary._dexscreener_get_tokens_meta
+TOKEN_META_COLUMNS = ["header", "image", "website", "twitter", "telegram", "discord", "facebook", "linkedin", "instagram"]
+
+# Birdeye PnL fields (flattened) kept for the analysis, missing values count as 0
+PNL_COLUMNS = {
+    "pnl.total_usd": "net_profit_usd",
+    "pnl.total_percent": "net_profit_percent",
+    "pnl.avg_profit_per_trade_usd": "avg_profit_per_trade",
+    "quantity.total_bought_amount": "total_tokens_bought",
+    "quantity.total_sold_amount": "total_tokens_sold",
+    "pricing.avg_buy_cost": "avg_buy_cost",
+    "pricing.avg_sell_cost": "avg_sell_cost",
+}
+TRADED_TOKEN_COLUMNS = ["mint_address", "block_timestamp", "block_number", "pair_address", "symbol"]
+
+# Dev proficiency buckets by tokens created (right-inclusive, e.g. "2-5" is 1 < tokens <= 5)
+DEV_TOKENS_BINS = [float("-inf"), 0, 1, 5, 10, float("inf")]
+DEV_TOKENS_LABELS = ["0", "1", "2-5", "6-10", "11+"]
+
+# --------------------------
+# Cached Data
+# ---------------------------
+
+@st.cache_resource(show_spinner=False)
+def _get_services() -> tuple[AppData, SolanaTokenSummary]:
+    # Long-lived clients, so their HTTP sessions keep pooled connections across reruns
+    return AppData(), SolanaTokenSummary()
+
 # --------------------------
 # Features
 # ---------------------------
@@ -26,6 +53,21 @@ def compute_metrics(combined_df):
     metrics = {}
     return metrics
 
+# Placeholder values the metadata providers use for a missing social link
+EMPTY_SOCIAL_VALUES = ["", "NULL", "None", "nan"]
+
+def valid_socials_mask(socials_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per cell, whether a social link is set (not null, empty or a placeholder value).
+    """
+    return ~socials_df.astype(str).apply(lambda column: column.str.strip()).isin(EMPTY_SOCIAL_VALUES)
+
+def bucket_average(bucket: pd.Series) -> float:
+    """
+    Average of a bucket aggregated with "sum" and "count" (NaN if empty, like .mean()).
+    """
+    return bucket["sum"] / bucket["count"] if bucket["count"] else float("nan")
+
 # --------------------------
 # Page
 # ---------------------------
@@ -33,8 +75,7 @@ def Page():
     CACHE_TTL = 60 * 60 * 1  # 1 hour
     MAX_TRADES_TOKENS = 400
 
-    app_data = AppData()
-    solana = SolanaTokenSummary()
+    app_data, solana = _get_services()
 
     # Set page title
     st.set_page_config(page_title="Wallet Analytics", page_icon="💰", layout="wide")
@@ -101,38 +142,17 @@ def Page():
         st.info("No PnL data found for this wallet's recent transactions.")
         return
     
-    parsed_pnls = []
-    for mint_address in recent_pnls:
-        data = recent_pnls[mint_address]
-
-        block_timestamp = None
-        block_number = None
-        pair_address = None
-        for token in recent_traded_tokens:
-            if token.get("mint_address") == mint_address:
-                block_timestamp = token.get("block_timestamp", "")
-                block_number = token.get("block_number", "")
-                pair_address = token.get("pair_address", "")
-                break
-
-        parsed_pnls.append({
-            "block_timestamp": block_timestamp,
-            "block_number": block_number,
-            "block_time": Utils.formatted_date(block_timestamp),
-            # "analyzed_at": data.get("analyzed_at", ""),
-            "mint_address": mint_address,
-            "pair_address": pair_address,
-            "symbol": token.get("symbol", ""),
-            "net_profit_usd": data.get("pnl", {}).get("total_usd", 0),
-            "net_profit_percent": data.get("pnl", {}).get("total_percent", 0),
-            "avg_profit_per_trade": data.get("pnl", {}).get("avg_profit_per_trade_usd", 0),
-            "total_tokens_bought": data.get("quantity", {}).get("total_bought_amount", 0),
-            "total_tokens_sold": data.get("quantity", {}).get("total_sold_amount", 0),
-            "avg_buy_cost": data.get("pricing", {}).get("avg_buy_cost", 0),
-            "avg_sell_cost": data.get("pricing", {}).get("avg_sell_cost", 0),
-        })
-
-    df_recent_pnls = pd.DataFrame(parsed_pnls)
+    # PnL per mint, joined with the mint's first traded token entry (block, pair and symbol)
+    df_pnls = pd.json_normalize(list(recent_pnls.values())).rename(columns=PNL_COLUMNS)
+    df_pnls = df_pnls.reindex(columns=list(PNL_COLUMNS.values()), fill_value=0).fillna(0)
+    df_pnls.insert(0, "mint_address", list(recent_pnls.keys()))
+
+    df_traded_tokens = pd.DataFrame(recent_traded_tokens, columns=TRADED_TOKEN_COLUMNS).drop_duplicates("mint_address")
+    df_recent_pnls = df_pnls.merge(df_traded_tokens, on="mint_address", how="left")
+    df_recent_pnls["block_time"] = df_recent_pnls["block_timestamp"].map(
+        lambda block_timestamp: Utils.formatted_date(None if pd.isna(block_timestamp) else block_timestamp)
+    )
+    df_recent_pnls = df_recent_pnls[["block_timestamp", "block_number", "block_time", "mint_address", "pair_address", "symbol", *PNL_COLUMNS.values()]]
     
     
     
@@ -149,17 +169,13 @@ def Page():
         st.info("No token metadata found.")
         return
     
-    columns = []
-    for token in tokens_meta.values():
-        if token:
-            columns.extend(token.keys())
-            break
-    columns = list(set(columns))
-
-    socials_df = pd.DataFrame.from_dict(tokens_meta, orient="index")
-    socials_df = socials_df.reindex(columns=columns)
-    socials_df.index.name = "mint_address"
-    socials_df.drop(columns=["name", "symbol", "decimals"], inplace=True, errors='ignore')
+    # Fixed schema built straight from the records, object dtype keeps .str working on columns without any link
+    socials_df = pd.DataFrame(
+        [token or {} for token in tokens_meta.values()],
+        index=pd.Index(list(tokens_meta.keys()), name="mint_address"),
+        columns=TOKEN_META_COLUMNS,
+        dtype=object,
+    )
 
     # merge the social_df with the analysis DataFrame
     df_analysis = df_recent_pnls.merge(socials_df, on="mint_address", how="left")
@@ -174,9 +190,9 @@ def Page():
         with st.spinner("Loading token security information (This may take a while)..."):
             tokens_security_info = solana._birdeye_get_tokens_security(mint_addresses)
 
-    for mint_address, security_info in tokens_security_info.items():
-        creator = security_info.get("creatorAddress", "")
-        df_analysis.loc[df_analysis["mint_address"] == mint_address, "developer_address"] = creator
+    # Mints without security info are left as NaN
+    creator_by_mint = {mint_address: security_info.get("creatorAddress", "") for mint_address, security_info in tokens_security_info.items()}
+    df_analysis["developer_address"] = df_analysis["mint_address"].map(creator_by_mint)
     
     # Add created pools info
     developer_created_pools = app_data.get_state(f"wa_developer_created_pools_{MAX_TRADES_TOKENS}")
@@ -184,8 +200,9 @@ def Page():
         with st.spinner("Loading wallets pools (This may take a while)..."):
             developer_created_pools = solana._solscan_get_wallets_created_pools(df_analysis['developer_address'].dropna().unique().tolist())
     
-    for developer, pools in developer_created_pools.items():
-        df_analysis.loc[df_analysis["developer_address"] == developer, "developer_total_tokens_created"] = len(pools)
+    # Devs without pools info are left as NaN (IGNORED in the dev analysis)
+    pools_count_by_developer = {developer: len(pools) for developer, pools in developer_created_pools.items()}
+    df_analysis["developer_total_tokens_created"] = df_analysis["developer_address"].map(pools_count_by_developer)
 
     #---------------------------------------
     # Output the Analysis Results
@@ -216,15 +233,8 @@ def Page():
 
     # --- Social Presence
     
-    # Always ensure required social columns exist
-    required_cols_fix = ['discord', 'twitter', 'instagram', 'facebook', 'telegram']
-    for col in required_cols_fix:
-        if col not in df_analysis.columns:
-            df_analysis[col] = ""
-
-    # Assuming socials_df is your DataFrame
-    socials_to_analyze = list(socials_df.columns)
-    socials_to_analyze = [c for c in df_analysis.columns if c not in ["website"] and c in required_cols_fix]
+    # Social columns to analyze (always present, from TOKEN_META_COLUMNS)
+    socials_to_analyze = ['discord', 'twitter', 'instagram', 'facebook', 'telegram']
 
     # Total unique tokens
     total_coins = len(df_analysis)
@@ -235,16 +245,12 @@ def Page():
 
     # Check if any social is valid per row
     socials_only = [s for s in socials_to_analyze if s != "website"]
-    df_analysis["has_social"] = df_analysis[socials_only].apply(
-        lambda row: any((str(v).strip() not in ["", "NULL", "None", "nan"]) for v in row), axis=1
-    )
+    socials_mask = valid_socials_mask(df_analysis[socials_only])
+    df_analysis["has_social"] = socials_mask.any(axis=1)
     count_coins_with_socials = df_analysis["has_social"].sum()
 
     # Count per social type
-    count_socials = {
-        social: ((df_analysis[social].notna()) & (df_analysis[social].astype(str).str.strip().isin(["", "NULL", "None", "nan"]) == False)).sum()
-        for social in socials_to_analyze
-    }
+    count_socials = socials_mask.sum().to_dict()
     
     st.write("#### Social Media Presence:")
 
@@ -296,9 +302,7 @@ def Page():
     df_twitter_only = df_analysis[
         ~df_analysis["has_website"] &
         (df_analysis["twitter"].notna() & (df_analysis["twitter"].str.strip() != "") & (df_analysis["twitter"].str.upper() != "NULL")) &
-        df_analysis[[s for s in socials_only if s != 'twitter']].apply(
-            lambda row: not any((str(v).strip() not in ["", "NULL", "None", "nan"]) for v in row), axis=1
-        )
+        ~socials_mask.drop(columns="twitter").any(axis=1)
     ]
     total_pnl_twitter_only = df_twitter_only['net_profit_usd'].sum()
     count_twitter_only = len(df_twitter_only)
@@ -324,14 +328,16 @@ def Page():
     st.write("---")
 
     df_dev_analysis_dev = df_analysis[df_analysis["developer_total_tokens_created"].notna()]
-    df_dev_analysis_dev_1 = df_dev_analysis_dev[df_dev_analysis_dev["developer_total_tokens_created"] == 1]
-    df_dev_analysis_dev_up_to_5 = df_dev_analysis_dev[df_dev_analysis_dev["developer_total_tokens_created"] <= 5]
-    df_dev_analysis_dev_5_to_10 = df_dev_analysis_dev[(
-        df_dev_analysis_dev["developer_total_tokens_created"] > 5)
-        & (df_dev_analysis_dev["developer_total_tokens_created"] <= 10)]
-    df_dev_analysis_dev_above_10 = df_dev_analysis_dev[df_dev_analysis_dev["developer_total_tokens_created"] > 10]
     count_rows_without_dev = df_analysis[df_analysis["developer_total_tokens_created"].isna()].shape[0]
 
+    # PnL per dev bucket in a single groupby
+    dev_tokens_bucket = pd.cut(df_dev_analysis_dev["developer_total_tokens_created"], bins=DEV_TOKENS_BINS, labels=DEV_TOKENS_LABELS)
+    dev_buckets = df_dev_analysis_dev.groupby(dev_tokens_bucket, observed=False)["net_profit_usd"].agg(["size", "count", "sum"])
+    dev_bucket_1 = dev_buckets.loc["1"]
+    dev_bucket_up_to_5 = dev_buckets.loc[["0", "1", "2-5"]].sum() # "1-5 Tokens" counts every dev with up to 5
+    dev_bucket_5_to_10 = dev_buckets.loc["6-10"]
+    dev_bucket_above_10 = dev_buckets.loc["11+"]
+
     # --- Dev Proficiency
 
     st.write("#### Developer Proficiency")
@@ -342,20 +348,20 @@ def Page():
     col3.metric("Avg. Tokens per Dev", f"{df_dev_analysis_dev['developer_total_tokens_created'].mean():.2f}")
 
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Devs with 1 Token", df_dev_analysis_dev_1.shape[0])
-    col2.metric("Devs with 1-5 Tokens", df_dev_analysis_dev_up_to_5.shape[0])
-    col3.metric("Devs with 5-10 Tokens", df_dev_analysis_dev_5_to_10.shape[0])
-    col4.metric("Devs with 10+ Tokens", df_dev_analysis_dev_above_10.shape[0])
+    col1.metric("Devs with 1 Token", int(dev_bucket_1["size"]))
+    col2.metric("Devs with 1-5 Tokens", int(dev_bucket_up_to_5["size"]))
+    col3.metric("Devs with 5-10 Tokens", int(dev_bucket_5_to_10["size"]))
+    col4.metric("Devs with 10+ Tokens", int(dev_bucket_above_10["size"]))
 
     # --- PnL by Dev Proficiency
 
     st.write("#### PnL Analysis by Developer Proficiency")
 
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Avg. PnL (when Dev 1 Token)", f"$ {df_dev_analysis_dev_1['net_profit_usd'].mean():,.2f}")
-    col2.metric("Avg. PnL (when Dev 1-5 Tokens)", f"$ {df_dev_analysis_dev_up_to_5['net_profit_usd'].mean():,.2f}")
-    col3.metric("Avg. PnL (when Dev 5-10 Tokens)", f"$ {df_dev_analysis_dev_5_to_10['net_profit_usd'].mean():,.2f}")
-    col4.metric("Avg. PnL (when Dev 10+ Tokens)", f"$ {df_dev_analysis_dev_above_10['net_profit_usd'].mean():,.2f}")
+    col1.metric("Avg. PnL (when Dev 1 Token)", f"$ {bucket_average(dev_bucket_1):,.2f}")
+    col2.metric("Avg. PnL (when Dev 1-5 Tokens)", f"$ {bucket_average(dev_bucket_up_to_5):,.2f}")
+    col3.metric("Avg. PnL (when Dev 5-10 Tokens)", f"$ {bucket_average(dev_bucket_5_to_10):,.2f}")
+    col4.metric("Avg. PnL (when Dev 10+ Tokens)", f"$ {bucket_average(dev_bucket_above_10):,.2f}")
 
 # --------------------------
 # INIT
@@ -1,12 +1,30 @@
 import os
 import json
 import time
+from functools import lru_cache
 from typing import Any, Union, Optional
 
-from lib.LocalCache import cache_handler
+from lib.LocalCache import cache_handler, DEFAULT_TTL_SECONDS
 from services.logger.Logger import _log
 
 DEFAULT_CACHE_TTL = 60
+STATE_MIN_REMAINING_TTL_RATIO = 0.5 # Unchanged state values are only rewritten below this share of their ttl
+
+@lru_cache(maxsize=None)
+def _load_config_file(config_file: str) -> dict:
+    """
+    Load and parse the JSON config file once per process.
+
+    Args:
+        config_file (str): Path to the JSON config file.
+
+    Returns:
+        dict: The parsed configuration, or an empty dict if the file does not exist.
+    """
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 class AppData:
     """
@@ -47,13 +65,9 @@ class AppData:
         if env_key in os.environ:
             return os.getenv(env_key)
 
-        # Otherwise, load from JSON config file
-        if os.path.exists(config_file):
-            with open(config_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get(key)
-
-        return None  # Return None if the key is not found in either place
+        # Otherwise, load from JSON config file (parsed once and kept in memory)
+        # Return None if the key is not found in either place
+        return _load_config_file(config_file).get(key)
 
     def get_api_key(self, key: str, default: str = "") -> str:
         """
@@ -136,8 +150,21 @@ class AppData:
             return self.clear_state(key)
         
         # Retrieve the current state or initialize a new dictionary
-        app_state = cache_handler.get("APP_DATA_STATE") or {}
-        
+        app_state, expire_at = cache_handler.get_with_expiry("APP_DATA_STATE")
+        app_state = app_state or {}
+        ttl = ttl if ttl is not None else DEFAULT_TTL_SECONDS
+
+        # Skip rewriting the whole state file when the value didn't change (reruns set the same values).
+        # It's still rewritten when that would leave it expiring later than `ttl` or with less
+        # than half of `ttl` left, so values that keep being set don't expire.
+        remaining_ttl = expire_at - time.time()
+        if key in app_state and ttl * STATE_MIN_REMAINING_TTL_RATIO <= remaining_ttl <= ttl:
+            try:
+                if bool(app_state[key] == value):
+                    return True
+            except (TypeError, ValueError):
+                pass  # Not comparable (e.g. DataFrames), just save it
+
         # Set the specific key within the state dictionary
         app_state[key] = value
         
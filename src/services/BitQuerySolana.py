@@ -1,6 +1,5 @@
 import json
 from time import time
-from numpy import record
 import requests
 import pandas as pd
 
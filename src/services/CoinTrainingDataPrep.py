@@ -20,6 +20,11 @@ from services.logger.Logger import _log
 DEFAULT_CACHE_TTL = 300
 MINUTE_IN_SECONDS = 60
 DAYS_IN_SECONDS = 24 * 60 * 60
+DATETIME_COLUMNS = [
+    "context_be_token_creation_time",
+    "context_be_pool_creation_time",
+    "bq_block_time"
+]
 
 class CoinTrainingDataPrep:
     """
@@ -61,8 +66,9 @@ class CoinTrainingDataPrep:
                 df_sol_summary[cell] = df_sol_summary[cell].str.replace("label: ", "")
                 df_sol_summary[cell] = df_sol_summary[cell].str.replace("url: ", "")
         
-        # Convert any other json cells to string
-        df_sol_summary = df_sol_summary.map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+        # Convert any other json cells to string (only object columns can hold them)
+        for col in df_sol_summary.select_dtypes(include="object").columns:
+            df_sol_summary[col] = df_sol_summary[col].map(lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
         
         # -- Add BitQuery data
         
@@ -76,7 +82,7 @@ class CoinTrainingDataPrep:
         
         # add wallets age
         tx_wallets = df_bitquery_transactions['bq_transaction_maker'].unique().tolist()
-        tx_ages = self.bitquery.estimate_wallets_age(tx_wallets)
+        tx_ages = self.get_wallet_ages(tx_wallets)
         df_bitquery_transactions['bq_transaction_maker_age_days'] = df_bitquery_transactions['bq_transaction_maker'].map(tx_ages)
         df_bitquery_transactions['bq_transaction_maker_age_days'] = df_bitquery_transactions['bq_transaction_maker_age_days'].replace({-1: 0})
 
@@ -93,7 +99,12 @@ class CoinTrainingDataPrep:
         df_sol_summary = df_sol_summary.rename(columns=lambda x: f"context_{x}" if x != "context" else x)
 
         # -- Add Current Transactions
-        df_merged = df_sol_summary.merge(df_bitquery_transactions, how="cross")
+        # The summary is a single row, so broadcast it onto every trade instead of a cross join
+        if df_sol_summary.empty:
+            df_merged = df_sol_summary.merge(df_bitquery_transactions, how="cross")
+        else:
+            context = df_sol_summary.iloc[0].to_dict()
+            df_merged = df_bitquery_transactions.assign(**context)[[*context, *df_bitquery_transactions.columns]]
 
         # -- Remove unwanted columns
         cols_to_remove = [
@@ -216,19 +227,11 @@ class CoinTrainingDataPrep:
             "context_be_liquidity_pool_usd",
             "context_dex_mc_usd"
         ]
-        for col in num_cols:
-            if col in df_merged.columns:
-                df_merged[col] = pd.to_numeric(df_merged[col], errors="coerce")
+        num_cols = df_merged.columns.intersection(num_cols)
+        df_merged[num_cols] = df_merged[num_cols].apply(pd.to_numeric, errors="coerce")
 
         # Datetime Columns
-        dt_cols = [
-            "context_be_token_creation_time",
-            "context_be_pool_creation_time",
-            "bq_block_time"
-        ]
-        for col in dt_cols:
-            if col in df_merged.columns:
-                df_merged[col] = pd.to_datetime(df_merged[col], errors="coerce")
+        df_merged = self.parse_datetime_columns(df_merged)
 
         # -- Store Data
         if save:
@@ -295,18 +298,59 @@ class CoinTrainingDataPrep:
         if filename:
             location = os.path.join(self.storage_dir, filename)
             if os.path.exists(location):
-                return pd.read_parquet(location)
+                return self.parse_datetime_columns(pd.read_parquet(location))
 
         # If not found, try to find by pair_address
         metadata = self.list_available_raw_training_metadata()
         for item in metadata:
             if item["pair_address"] == pair_address:
-                return pd.read_parquet(item["location"])
+                return self.parse_datetime_columns(pd.read_parquet(item["location"]))
 
         # If not found, return an empty DataFrame
         return pd.DataFrame()
     
     
+    def parse_datetime_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the datetime columns of a raw training DataFrame to datetime64, so consumers don't have to.
+        Columns that are already datetime64 (e.g. read back from parquet) are left as is.
+
+        Args:
+            df (pd.DataFrame): The raw training DataFrame.
+
+        Returns:
+            pd.DataFrame: The DataFrame with parsed datetime columns.
+        """
+        for col in DATETIME_COLUMNS:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        return df
+
+    def get_wallet_ages(self, wallet_addresses: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Get the age in days for a list of wallets.
+
+        Resolved ages are kept for the current UTC day, so wallets that trade
+        several pairs are only looked up once.
+
+        Args:
+            wallet_addresses (List[str]): The wallet addresses to look up.
+
+        Returns:
+            Dict[str, Optional[int]]: Mapping of wallet address -> age in days.
+        """
+        cache_key = f"CTD_WALLET_AGES_{datetime.now(timezone.utc).strftime('%Y%m%d')}"
+        wallet_ages = cache_handler.get(cache_key) or {}
+
+        new_wallets = [wallet for wallet in wallet_addresses if wallet not in wallet_ages]
+        if new_wallets:
+            new_ages = self.bitquery.estimate_wallets_age(new_wallets)
+            # Don't keep failed lookups (None), so they are retried next time
+            wallet_ages.update({wallet: age for wallet, age in new_ages.items() if age is not None})
+            cache_handler.set(cache_key, wallet_ages, DAYS_IN_SECONDS)
+
+        return {wallet: wallet_ages.get(wallet) for wallet in wallet_addresses}
+
     # --------------------------
     # File Operations
     # --------------------------
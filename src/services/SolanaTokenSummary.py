@@ -10,6 +10,8 @@ from collections import defaultdict
 
 import aiohttp
 import asyncio
+import contextvars
+import threading
 
 from services.AppData import AppData
 from lib.LocalCache import cache_handler
@@ -19,10 +21,15 @@ from lib.SimpleBatchRequester import SimpleBatchRequester
 
 DEFAULT_CACHE_TTL = 600
 RPC_CACHE_TTL = 2
+RPC_CONCURRENCY_LIMIT = 10
 MINUTE_IN_SECONDS = 60
 HOUR_IN_SECONDS = 60 * 60
 DAY_IN_SECONDS = 60 * 60 * 24
 
+# aiohttp session of the running `_run_async` call. It's per run (and so per thread) rather
+# than per instance, since instances are shared across Streamlit sessions.
+_async_session = contextvars.ContextVar("solana_async_session", default=None)
+
 class SolanaTokenSummary:
     """
     SolanaTokenSummary is a class designed to retrieve and aggregate comprehensive
@@ -51,15 +58,38 @@ class SolanaTokenSummary:
             raise ValueError("rpc_endpoints must be a URL string or list")
         
         # Synchronous session for standard methods
+        # (async methods get theirs from `_run_async`)
         self.session = requests.Session()
-        
-        # Asynchronous session for high-performance methods
-        self._async_session = None
+
+        # Batch requesters by max_workers, kept so their worker pools are reused across calls
+        self._batch_requesters = {}
+        self._batch_requesters_lock = threading.Lock()
 
         self.birdeye_api_key = AppData().get_api_key("birdeye_api_key")
         self.solscan_api_key = AppData().get_api_key("solscan_api_key")
         self.instance_id = Utils.hash(self.rpc_endpoints) # For caching
 
+    def close(self):
+        """
+        Closes the HTTP session and shuts down the batch requesters' worker pools.
+        """
+        with self._batch_requesters_lock:
+            batch_requesters, self._batch_requesters = self._batch_requesters, {}
+        for batch_requester in batch_requesters.values():
+            batch_requester.close()
+        self.session.close()
+
+    def _get_batch_requester(self, max_workers: int) -> SimpleBatchRequester:
+        """
+        Returns the instance's SimpleBatchRequester for `max_workers`, creating it on first use.
+        """
+        with self._batch_requesters_lock:
+            batch_requester = self._batch_requesters.get(max_workers)
+            if batch_requester is None:
+                batch_requester = SimpleBatchRequester(max_workers=max_workers)
+                self._batch_requesters[max_workers] = batch_requester
+            return batch_requester
+
     # --------------------------
     # Solana RPC info
     # --------------------------
@@ -143,7 +173,7 @@ class SolanaTokenSummary:
             int: The estimated age of the wallet in days, or -1 if not found.
         """
         try:
-            ages = asyncio.run(self._rpc_estimate_wallet_ages_async([wallet_address]))
+            ages = self._run_async(self._rpc_estimate_wallet_ages_async([wallet_address]))
             age = ages[0]
         except (IndexError, RuntimeError) as e:
             _log(f"Error estimating single wallet age: {e}", level="ERROR")
@@ -157,7 +187,7 @@ class SolanaTokenSummary:
         It starts and manages the asyncio event loop for the asynchronous task.
         """
         # Call the async function that does the real work.
-        return asyncio.run(self._rpc_estimate_wallet_ages_async(wallet_addresses))
+        return self._run_async(self._rpc_estimate_wallet_ages_async(wallet_addresses))
 
     async def _rpc_estimate_wallet_ages_async(self, wallet_addresses: List[str]) -> List[int]:
         """
@@ -173,8 +203,11 @@ class SolanaTokenSummary:
         """
         rpc_batches = defaultdict(list)
         
+        # Each wallet is only resolved once, even if it appears multiple times.
+        unique_wallets = list(dict.fromkeys(wallet_addresses))
+
         # Shuffle the wallet addresses to ensure an even and random distribution.
-        random.shuffle(wallet_addresses)
+        random.shuffle(unique_wallets)
 
         # Distribute the wallets evenly among the RPC nodes.
         num_endpoints = len(self.rpc_endpoints)
@@ -182,7 +215,7 @@ class SolanaTokenSummary:
             _log("No RPC endpoints configured.", level="ERROR")
             return [-1] * len(wallet_addresses)
 
-        for i, wallet in enumerate(wallet_addresses):
+        for i, wallet in enumerate(unique_wallets):
             rpc_url = self.rpc_endpoints[i % num_endpoints]
             rpc_batches[rpc_url].append(wallet)
 
@@ -195,21 +228,21 @@ class SolanaTokenSummary:
         # Use asyncio.gather to run all the batch tasks concurrently.
         all_results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Flatten the list of results from all batches and handle exceptions.
-        final_results = []
-        for batch_result in all_results:
+        # Map the results of each batch back to its wallets and handle exceptions.
+        ages = {}
+        for wallets_checked, batch_result in zip(rpc_batches.values(), all_results):
             if isinstance(batch_result, Exception):
                 _log(f"Error processing a batch: {batch_result}", level="ERROR")
-                # Append a list of -1s to represent failure for that batch
-                final_results.extend([-1] * len(rpc_batches.values()))
-            else:
-                final_results.extend(batch_result)
+                # Mark every wallet of the failed batch as -1
+                batch_result = [-1] * len(wallets_checked)
+            ages.update(zip(wallets_checked, batch_result))
         
-        return final_results
+        return [ages.get(wallet, -1) for wallet in wallet_addresses]
 
     async def _rpc_estimate_batch_ages_async(self, rpc_url: str, wallet_addresses: List[str]) -> List[int]:
         """
         Helper to run a batch of async tasks against a specific RPC node.
+        At most RPC_CONCURRENCY_LIMIT requests are in flight per node to respect its rate limits.
         
         Args:
             rpc_url (str): The RPC endpoint to use for all requests in this batch.
@@ -218,10 +251,13 @@ class SolanaTokenSummary:
         Returns:
             List[int]: The list of ages for the processed wallets.
         """
-        tasks = [
-            self._rpc_estimate_wallet_age_async(wallet_address, rpc_url=rpc_url)
-            for wallet_address in wallet_addresses
-        ]
+        semaphore = asyncio.Semaphore(RPC_CONCURRENCY_LIMIT)
+
+        async def _bounded_estimate(wallet_address: str) -> int:
+            async with semaphore:
+                return await self._rpc_estimate_wallet_age_async(wallet_address, rpc_url=rpc_url)
+
+        tasks = [_bounded_estimate(wallet_address) for wallet_address in wallet_addresses]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -331,6 +367,36 @@ class SolanaTokenSummary:
         _log(f"All {max_retries} attempts failed for method {method}.", level="ERROR")
         return {}
     
+    def _run_async(self, coro) -> Any:
+        """
+        Runs a coroutine in a new event loop (asyncio.run), with an aiohttp session that
+        all its requests share and that is closed when it finishes.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            Any: The coroutine's result.
+        """
+        async def run_with_session():
+            async with aiohttp.ClientSession() as session:
+                _async_session.set(session)
+                return await coro
+
+        return asyncio.run(run_with_session())
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the aiohttp session of the running `_run_async` call.
+
+        Raises:
+            RuntimeError: If called outside of `_run_async`.
+        """
+        session = _async_session.get()
+        if session is None or session.closed:
+            raise RuntimeError("Async methods must be run through _run_async")
+        return session
+
     @cache_handler.cache(ttl_s=RPC_CACHE_TTL)
     async def _rpc_fetch_async(self, method: str, params: list, rpc_url: Optional[str] = None) -> dict:
         """
@@ -352,12 +418,10 @@ class SolanaTokenSummary:
         if rpc_url:
             # Use a single, specified RPC URL
             try:
-                # Use a session if it exists, otherwise create a new one for this call
-                if not self._async_session or self._async_session.closed:
-                    self._async_session = aiohttp.ClientSession()
-                
+                session = self._get_async_session()
+
                 payload = { "jsonrpc": "2.0", "id": 1, "method": method, "params": params }
-                response = await self._async_session.post(rpc_url, json=payload, timeout=10)
+                response = await session.post(rpc_url, json=payload, timeout=10)
                 response.raise_for_status()
                 return await response.json()
             except Exception as e:
@@ -366,9 +430,8 @@ class SolanaTokenSummary:
         else:
             # Fallback to the original "race" logic if no URL is provided
             tasks = []
-            if not self._async_session or self._async_session.closed:
-                self._async_session = aiohttp.ClientSession()
-                
+            session = self._get_async_session()
+
             for endpoint in self.rpc_endpoints:
                 payload = {
                     "jsonrpc": "2.0",
@@ -378,7 +441,7 @@ class SolanaTokenSummary:
                 }
                 tasks.append(
                     asyncio.create_task(
-                        self._async_session.post(endpoint, json=payload, timeout=10)
+                        session.post(endpoint, json=payload, timeout=10)
                     )
                 )
 
@@ -730,14 +793,13 @@ class SolanaTokenSummary:
             dict: A dictionary mapping each mint address to its token summary.
         """
         try:
-            batch_requester = SimpleBatchRequester(max_workers=2)
             batch = []
             for mint in mint_addresses:
                 batch.append(
                     {"id": mint, "cache_time": 30, "url": f"https://api.dexscreener.com/latest/dex/tokens/{mint}", "timeout": 10}
                 )
 
-            responses = batch_requester.run(batch)
+            responses = self._get_batch_requester(2).run(batch)
             summaries = {}
             for response in responses:
                 if response:
@@ -1134,7 +1196,6 @@ class SolanaTokenSummary:
         }
 
         try:
-            batch_requester = SimpleBatchRequester(max_workers=4)
             batch = []
             for i, params in enumerate(params_list):
                 request_id = Utils.hash([params, str(i)]) + f"_{i}"
@@ -1154,7 +1215,7 @@ class SolanaTokenSummary:
                     "cache_time": 300  # Cache for 5 minutes
                 })
 
-            responses = batch_requester.run(batch)
+            responses = self._get_batch_requester(4).run(batch)
             results = {}
             for response in responses:
                 if not response:
@@ -1345,7 +1406,6 @@ class SolanaTokenSummary:
         }
 
         try:
-            batch_requester = SimpleBatchRequester(max_workers=4)
             batch = []
             for i, params in enumerate(params_list):
                 request_id = Utils.hash([params, str(i)]) + f"_{i}"
@@ -1358,7 +1418,7 @@ class SolanaTokenSummary:
                     "cache_time": 300  # Cache for 5 minutes
                 })
 
-            responses = batch_requester.run(batch)
+            responses = self._get_batch_requester(4).run(batch)
             results = {}
             for response in responses:
                 if not response:
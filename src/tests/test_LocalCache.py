@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+import math
+import orjson
+import os
+import pytest
+import shutil
+import time
+import uuid
+
+import pandas as pd
+
+from lib.LocalCache import cache_handler
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """
+    Points the shared cache handler (used by the decorators below too) at an empty
+    temporary dir, so tests don't touch the app's cache files or its disabled flag.
+    """
+    monkeypatch.setattr(cache_handler, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(cache_handler, "cache_disabled_flag", str(tmp_path / ".py-local-cache-disabled"))
+    monkeypatch.setattr(cache_handler, "_disabled_check", (False, float("-inf")))
+    monkeypatch.setattr(cache_handler, "_known_dirs", set())
+    monkeypatch.setattr(cache_handler, "_known_keys", {})
+    monkeypatch.setattr(cache_handler, "_last_access", {})
+    monkeypatch.setattr(cache_handler, "_total_bytes", 0)
+    monkeypatch.setattr(cache_handler, "_memory", OrderedDict())
+
+def test_set_get_roundtrip():
+    # JSON-able values
+    key = f"test_{uuid.uuid4().hex}"
+    value = {"a": 1, "b": [1, 2.5, "x"], "c": None}
+    cache_handler.set(key, value, 60)
+    assert cache_handler.get(key) == value
+
+    # Values that must keep their type go through Pickle
+    key = f"test_{uuid.uuid4().hex}"
+    value = {"when": datetime(2025, 8, 14, 15, 30, 39, tzinfo=timezone.utc), 1: "int key"}
+    cache_handler.set(key, value, 60)
+    assert cache_handler.get(key) == value
+
+    key = f"test_{uuid.uuid4().hex}"
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    cache_handler.set(key, df, 60)
+    pd.testing.assert_frame_equal(cache_handler.get(key), df)
+
+def test_expired_value():
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, "value", -1)
+    assert cache_handler.get(key) is None
+
+_calls = []
+
+@cache_handler.cache(ttl_s=60)
+def _add(a, b, token=None):
+    _calls.append((a, b))
+    return a + b
+
+def test_cache_decorator():
+    token = uuid.uuid4().hex
+
+    assert _add(1, 2, token=token) == 3
+    assert _add(1, 2, token=token) == 3
+    assert _add(2, 2, token=token) == 4
+    assert _calls == [(1, 2), (2, 2)]
+
+@cache_handler.cache(ttl_s=60)
+def _make_list(token=None):
+    return [1, 2, 3]
+
+def test_cache_decorator_returns_copies():
+    token = uuid.uuid4().hex
+
+    # Mutating a result must not leak into later hits (memory or disk)
+    first = _make_list(token=token)
+    first.append(4)
+    assert _make_list(token=token) == [1, 2, 3]
+    assert _make_list(token=token) is not _make_list(token=token)
+
+def test_dataframe_roundtrip_stays_writable():
+    # Large numeric frames are stored with out-of-band pickle buffers
+    key = f"test_{uuid.uuid4().hex}"
+    df = pd.DataFrame({"a": range(100_000), "b": [0.5] * 100_000, "c": ["x"] * 100_000})
+    cache_handler.set(key, df, 60)
+
+    loaded = cache_handler.get(key)
+    pd.testing.assert_frame_equal(loaded, df)
+
+    loaded.loc[0, "a"] = 42
+    assert loaded.loc[0, "a"] == 42
+
+@cache_handler.cache(ttl_s=60)
+def _echo(value, token=None):
+    return [value]
+
+def test_cache_decorator_keeps_equal_args_apart():
+    token = uuid.uuid4().hex
+
+    # 1, 1.0 and True compare equal but must not share a cache entry
+    assert _echo(1, token=token) == [1]
+    assert type(_echo(1.0, token=token)[0]) is float
+    assert _echo(True, token=token) == [True] and type(_echo(True, token=token)[0]) is bool
+
+def test_large_json_roundtrip():
+    # Files above MMAP_MIN_BYTES are parsed from a memory map (too large for the memory LRU)
+    key = f"test_{uuid.uuid4().hex}"
+    value = {"items": [{"id": i, "name": f"token {i}"} for i in range(50_000)]}
+    cache_handler.set(key, value, 60)
+    assert cache_handler.get(key) == value
+
+def test_get_is_served_from_memory():
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, {"a": [1, 2]}, 60)
+
+    # Removing the file doesn't affect a key held in memory
+    os.remove(cache_handler._get_file_path(key, ext=".json"))
+    value = cache_handler.get(key)
+    assert value == {"a": [1, 2]}
+
+    # Each get returns its own copy
+    value["a"].append(3)
+    assert cache_handler.get(key) == {"a": [1, 2]}
+
+def test_disable_cache():
+    token = uuid.uuid4().hex
+    _calls.clear()
+
+    cache_handler.disable_cache()
+    try:
+        _add(5, 5, token=token)
+        _add(5, 5, token=token)
+        assert _calls == [(5, 5), (5, 5)]
+    finally:
+        cache_handler.enable_cache()
+
+    _add(5, 5, token=token)
+    _add(5, 5, token=token)
+    assert _calls == [(5, 5), (5, 5), (5, 5)]
+
+def test_get_with_expiry():
+    key = f"test_{uuid.uuid4().hex}"
+    assert cache_handler.get_with_expiry(key) == (None, 0)
+
+    cache_handler.set(key, "value", 60)
+    value, expire_at = cache_handler.get_with_expiry(key)
+    assert value == "value"
+    assert 50 < expire_at - time.time() <= 60
+
+def test_non_finite_floats_roundtrip():
+    # orjson would write NaN/Infinity as null, so these must come back the same from disk
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, {"a": [1.5, float("inf")], "b": None}, 60)
+    cache_handler._memory.pop(key, None)
+    assert cache_handler.get(key) == {"a": [1.5, float("inf")], "b": None}
+
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, [float("nan")], 60)
+    cache_handler._memory.pop(key, None)
+    assert math.isnan(cache_handler.get(key)[0])
+
+def test_entries_written_by_other_processes_are_found():
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, {"a": 1}, 60)
+
+    # Same state as a key another process wrote after this one started
+    cache_handler._known_keys.pop(key)
+    cache_handler._memory.pop(key, None)
+    assert cache_handler.get(key) == {"a": 1}
+    assert cache_handler._known_keys[key] == ".json"
+
+def test_set_recreates_removed_subfolder():
+    key = f"test_{uuid.uuid4().hex}"
+    cache_handler.set(key, "value", 60)
+
+    # Clearing the cache by hand removes subfolders the handler already created
+    path = cache_handler._get_file_path(key, ext=".json")
+    shutil.rmtree(os.path.dirname(path))
+
+    cache_handler.set(key, "value", 60)
+    assert os.path.exists(path)
+
+def test_set_removes_other_format_written_by_other_processes():
+    key = f"test_{uuid.uuid4().hex}"
+    when = datetime(2025, 8, 14, 15, 30, 39, tzinfo=timezone.utc)
+    cache_handler.set(key, {"when": when}, 60)
+    assert cache_handler._known_keys[key] == ".pkl"
+
+    # Another process rewrote the key as JSON (removing the Pickle file)
+    other = {"expire_at": time.time() + 60, "value": {"when": "stale"}}
+    cache_handler._write_file(cache_handler._get_file_path(key, ext=".json"), orjson.dumps(other))
+    os.remove(cache_handler._get_file_path(key, ext=".pkl"))
+    cache_handler._memory.pop(key, None)
+    assert cache_handler.get(key) == {"when": "stale"}
+
+    # Writing it as Pickle again must not leave that JSON file behind
+    cache_handler.set(key, {"when": when}, 60)
+    cache_handler._known_keys.pop(key)
+    cache_handler._memory.pop(key, None)
+    assert cache_handler.get(key) == {"when": when}
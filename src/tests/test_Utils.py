@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 import pytest
 import time
 
@@ -26,6 +26,22 @@ def test_formatted_date():
     formatted_date = Utils.formatted_date(dt, delta_seconds=delta_seconds)
     assert formatted_date == "2025-08-14T14:30:39Z"
 
+def test_slugify():
+    assert Utils.slugify("Hello World") == "hello-world"
+    assert Utils.slugify("  Ação   Pingüino! ") == "acao-pinguino"
+    assert Utils.slugify("--Já_é 100%--") == "jae-100"
+    assert Utils.slugify("Šřā Ōkami") == "sra-okami"
+
+def test_is_json():
+    assert Utils.is_json('{"a": [1, 2]}')
+    assert Utils.is_json("  [1, 2]")
+    assert Utils.is_json("-1.5")
+    assert not Utils.is_json("hello")
+    assert not Utils.is_json("")
+    assert not Utils.is_json('{"a": ')
+    assert Utils.is_json(b' {"a": 1}')
+    assert not Utils.is_json(b"<html>")
+
 def test_flatten_json_to_string():
     nested_json = {
         "a": 1,
@@ -38,4 +54,32 @@ def test_flatten_json_to_string():
     expected_flattened = "a: 1, keyname: value, b.c: 2, b.d: 3"
     
     flattened = Utils.flatten_json_to_string(nested_json)
-    assert flattened == expected_flattened
\ No newline at end of file
+    assert flattened == expected_flattened
+
+    # Lists of dicts keep the parent key
+    nested_json = {"pairs": [{"dex": "raydium", "liquidity": {"usd": 10}}, "other"]}
+    expected_flattened = "pairs.dex: raydium, pairs.liquidity.usd: 10, other"
+    assert Utils.flatten_json_to_string(nested_json) == expected_flattened
+
+def test_to_date_string_recursive():
+    items = {
+        "a": datetime(2025, 8, 14, 15, 30, 39),
+        "b": {"c": [datetime(2025, 8, 15), 1, "x"]},
+        "d": [{"e": datetime(2025, 8, 16, 1, 2, 3)}],
+    }
+    expected = {
+        "a": "2025-08-14T15:30:39Z",
+        "b": {"c": ["2025-08-15T00:00:00Z", 1, "x"]},
+        "d": [{"e": "2025-08-16T01:02:03Z"}],
+    }
+    assert Utils.to_date_string_recursive(items) == expected
+
+def test_to_datetime():
+    dt = datetime(2025, 8, 14, 15, 30, 39)
+    assert Utils.to_datetime(dt) is dt
+    assert Utils.to_datetime("2025-08-14T15:30:39") == dt
+    assert Utils.to_datetime(date(2025, 8, 14)) == datetime(2025, 8, 14)
+    assert Utils.to_datetime(dt.timestamp()) == dt
+    assert Utils.to_datetime(int(dt.timestamp())) == dt
+    # Compact iso strings don't look like iso dates but still parse
+    assert Utils.to_datetime("20250814T153039") == dt